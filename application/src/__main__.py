@@ -2,7 +2,6 @@
 import logging
 import os
 import os.path
-import sqlite3
 import time
 
 from dotenv import load_dotenv
@@ -15,25 +14,17 @@ from flask_restx import Api
 from application.src.api.upload_file import (
     caminho_img,
     register_file_routes,
-    send_from_directory,
 )
-from application.src.database.configure_post import (
-    banco_post,
-    criar_tabela_post,
-)
-from application.src.database.users.configure_users import (
-    add_column,
-    create_database,
+from application.src.database.conexao import checkpointer, users_db
+from application.src.database.migracoes import run_migrations
+from application.src.services.static_assets import (
+    register_static_assets,
+    send_media,
 )
 
 cache = Cache()
 
 
-# Função para obter a conexão com o banco de dados
-def get_db_connection():
-    return sqlite3.connect("usuarios.db")
-
-
 # Classe User com suporte ao Flask-Login | Podemos add novos paramentros ex:
 # email etc... Talves
 class User(UserMixin):
@@ -43,13 +34,10 @@ class User(UserMixin):
 
     @staticmethod
     def get(user_id):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, name FROM usuarios WHERE id = ?", (user_id,)
-        )
-        user = cursor.fetchone()
-        conn.close()
+        with users_db(readonly=True) as conn:
+            user = conn.execute(
+                "SELECT id, name FROM usuarios WHERE id = ?", (user_id,)
+            ).fetchone()
 
         if user:
             return User(user[0], user[1])
@@ -82,7 +70,7 @@ def create_app():
     app.add_url_rule(
         "/files/<filename>",
         endpoint="files",
-        view_func=send_from_directory,
+        view_func=send_media,  # ETag forte pelo conteúdo + If-None-Match
         defaults={"directory": caminho_img},
     )
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
@@ -143,10 +131,41 @@ def create_app():
 
     app.register_blueprint(query)
 
-    create_database()  # Banco de dados
-    add_column()  # add coluna no banco
-    banco_post()  # banco de dados para posts | Null
-    criar_tabela_post()  # init tabalas
+    from application.src.routes.metrics import metrics_
+
+    app.register_blueprint(metrics_)
+
+    from application.src.routes.follow import follow_
+
+    app.register_blueprint(follow_)
+
+    # Contadores de chamadas externas por requisição (FeedSnapshot)
+    from application.src.services.feed_snapshot import register_feed_snapshot
+
+    register_feed_snapshot(app)
+
+    # post_card() nos templates (cache de fragmento dos cards de post)
+    from application.src.services.fragment_cache import register_fragment_cache
+
+    register_fragment_cache(app)
+
+    # Eventos de escrita -> gerações nas chaves de cache / cache de perfis
+    from application.src.services.cache_generations import (
+        register_invalidation_handlers,
+    )
+
+    register_invalidation_handlers(app)
+
+    # gzip/brotli nas respostas e .br/.gz pré-comprimidos em /static
+    from application.src.services.compression import register_compression
+
+    register_compression(app)
+
+    # ?v=<hash> nos CSS/JS (Cache-Control: immutable)
+    register_static_assets(app)
+
+    run_migrations()  # Esquema dos bancos (PRAGMA user_version)
+    checkpointer.start()  # Checkpoint do WAL em segundo plano
 
     # Configuração do Flask-Login
     login_manager = LoginManager()
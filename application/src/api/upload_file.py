@@ -1,11 +1,20 @@
 import os
-import sqlite3
 from datetime import datetime
 
 from dotenv import load_dotenv
-from flask import jsonify, request, send_from_directory
+from flask import jsonify, request
 from flask_restx import Api, Namespace, Resource, fields
 
+from application.src.database.conexao import users_db
+from application.src.database.unit_of_work import posts_unit, users_unit
+from application.src.database.users.configure_users import refresh_user_card
+from application.src.services.invalidation import (
+    AVATAR_CHANGED,
+    BANNER_CHANGED,
+    POST_CREATED,
+)
+from application.src.services.static_assets import send_media
+
 load_dotenv()  # Carrega variáveis do arquivo .env
 
 # Caminho onde as imagens serão salvas
@@ -66,19 +75,16 @@ class CriandoPostagem(Resource):
             file.save(img_path)
 
         try:
-            conn = sqlite3.connect("banco_posts_comunidade.db")
-            cursor = conn.cursor()
             data_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            cursor.execute(
-                """
-                INSERT INTO post_do_usuario (nome, data, img_path)
-                VALUES (?, ?, ?)
-                """,
-                (nome, data_atual, img_path),
-            )
-            conn.commit()
-            post_id = cursor.lastrowid
-            conn.close()
+            with posts_unit() as uow:
+                post_id = uow.insert(
+                    """
+                    INSERT INTO post_do_usuario (nome, data, img_path)
+                    VALUES (?, ?, ?)
+                    """,
+                    (nome, data_atual, img_path),
+                )
+                uow.publish(POST_CREATED, nome=nome)
 
             response_data = {
                 "id": post_id,
@@ -103,15 +109,6 @@ class UploadBanner(Resource):
         if not uploaded_file:
             return 400
 
-        conn = sqlite3.connect(os.getenv("BANCO_DB"))
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM usuarios WHERE id = ?", (user_id,))
-        user = cursor.fetchone()
-
-        if user is None:
-            conn.close()
-            return {"error": "Usuário não encontrado"}, 404
-
         # Define o nome e caminho relativo do arquivo
         ext = os.path.splitext(uploaded_file.filename)[1]
         banner_filename = (
@@ -121,18 +118,23 @@ class UploadBanner(Resource):
             "fotos", banner_filename
         )  # Exemplo: fotos/banner_userid_timestamp.png
 
+        # Atualiza o caminho relativo no banco de dados; nenhuma linha
+        # alterada = usuário não existe
+        with users_unit() as uow:
+            updated = uow.execute(
+                "UPDATE usuarios SET banner = ? WHERE id = ?",
+                (relative_file_path, user_id),
+            ).rowcount
+            if updated:
+                uow.publish(BANNER_CHANGED, user_id=user_id)
+
+        if not updated:
+            return {"error": "Usuário não encontrado"}, 404
+
         # Caminho absoluto para salvar o arquivo fisicamente
         banner_path = os.path.join(caminho_img, banner_filename)
         uploaded_file.save(banner_path)
 
-        # Atualiza o caminho relativo no banco de dados
-        cursor.execute(
-            "UPDATE usuarios SET banner = ? WHERE id = ?",
-            (relative_file_path, user_id),
-        )
-        conn.commit()
-        conn.close()
-
         return {
             "filename": banner_filename,
             "content_type": uploaded_file.content_type,
@@ -145,12 +147,8 @@ class UploadBanner(Resource):
 @api.route("/<int:user_id>", endpoint="get_file")
 class GetFile(Resource):
     def get(self, user_id):
-        conn = sqlite3.connect(os.getenv("BANCO_DB"))
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT photo FROM usuarios WHERE id = ?", (user_id,))
-        user = cursor.fetchone()
-        conn.close()
+        with users_db(readonly=True) as conn:
+            user = conn.execute("SELECT photo FROM usuarios WHERE id = ?", (user_id,)).fetchone()
 
         if user is None or user[0] is None:
             return jsonify({
@@ -163,7 +161,7 @@ class GetFile(Resource):
         if not os.path.exists(absolute_file_path):
             return {"error": "Arquivo não encontrado"}, 404
 
-        return send_from_directory(caminho_img, relative_file_path)
+        return send_media(caminho_img, relative_file_path)
 
 
 @api.route("/uploadfile/<int:user_id>")  # Aqui o tipo int é explicitado
@@ -183,34 +181,29 @@ class UploadFile(Resource):
         if not uploaded_file:
             return {"error": "Nenhum arquivo enviado"}, 400
 
-        # Conectar ao banco e verificar se o usuário existe
-        conn = sqlite3.connect(os.getenv("BANCO_DB"))
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT id FROM usuarios WHERE id = ?", (user_id,))
-        user = cursor.fetchone()
-
-        if user is None:
-            conn.close()
-            return {"error": "Usuário não encontrado"}, 404
-
         # Define o caminho relativo da imagem
         relative_file_path = os.path.join(
             "fotos", uploaded_file.filename
         )  # Ex: 'fotos/foto.jpg'
 
-        # Salva o caminho relativo no banco de dados
-        cursor.execute(
-            "UPDATE usuarios SET photo = ? WHERE id = ?",
-            (relative_file_path, user_id),
-        )
-        conn.commit()
+        # Salva o caminho relativo no banco de dados (e a foto dos cards do
+        # feed) em uma transação; nenhuma linha alterada = usuário não existe
+        with users_unit() as uow:
+            updated = uow.execute(
+                "UPDATE usuarios SET photo = ? WHERE id = ?",
+                (relative_file_path, user_id),
+            ).rowcount
+            if updated:
+                refresh_user_card(uow.banco, user_id=user_id)
+                uow.publish(AVATAR_CHANGED, user_id=user_id)
+
+        if not updated:
+            return {"error": "Usuário não encontrado"}, 404
 
         # Salva o arquivo no diretório de uploads
         file_path = os.path.join(caminho_img, uploaded_file.filename)
         uploaded_file.save(file_path)
 
-        conn.close()
         print("200")
         return {
             "filename": uploaded_file.filename,
@@ -0,0 +1,424 @@
+import contextlib
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+USERS_DB = os.getenv("BANCO_DB", "usuarios.db")
+POSTS_DB = os.getenv("BANCO_POST", "banco_posts_comunidade.db")
+
+# Conexões por pool (por processo). Leituras e escritas têm pools separados:
+# as conexões de leitura são abertas com `query_only`.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 8))
+DB_WRITE_POOL_SIZE = int(os.getenv("DB_WRITE_POOL_SIZE", 2))
+# Espera máxima (s) por uma conexão livre e por um lock do SQLite
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", 10))
+# Statements preparados guardados por conexão (sqlite3 `cached_statements`)
+DB_STATEMENT_CACHE = int(os.getenv("DB_STATEMENT_CACHE", 256))
+# Uma conexão emprestada há mais tempo que isso (s) é registrada como vazamento
+DB_LEAK_SECONDS = float(os.getenv("DB_LEAK_SECONDS", 30))
+# Lote de parâmetros por consulta em `IN (...)`: SQLite antigo aceita no
+# máximo 999 (SQLITE_MAX_VARIABLE_NUMBER)
+MAX_PARAMS = 900
+
+# Perfil de armazenamento: "wal" (padrão) ou "legacy" (rollback journal e
+# pragmas padrão do SQLite, a configuração antiga; útil para comparar)
+DB_STORAGE_PROFILE = os.getenv("DB_STORAGE_PROFILE", "wal")
+# Checkpoint em segundo plano: a cada DB_CHECKPOINT_INTERVAL segundos um
+# checkpoint PASSIVE (não bloqueia ninguém); TRUNCATE quando o -wal passa de
+# DB_WAL_TRUNCATE_BYTES. O autocheckpoint do SQLite fica com um limite alto,
+# só como rede de segurança, para o commit de quem escreve não pagar o checkpoint.
+DB_CHECKPOINT_INTERVAL = float(os.getenv("DB_CHECKPOINT_INTERVAL", 30))
+DB_WAL_TRUNCATE_BYTES = int(os.getenv("DB_WAL_TRUNCATE_BYTES", 64 * 1024 * 1024))
+DB_WAL_AUTOCHECKPOINT = int(os.getenv("DB_WAL_AUTOCHECKPOINT", 4000))  # páginas
+
+STORAGE_PROFILES = {
+    "legacy": {},
+    "wal": {
+        "journal_mode": "WAL",
+        # Em WAL, NORMAL só sincroniza no checkpoint: sem corrupção, no pior
+        # caso uma queda de energia perde os últimos commits
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": DB_WAL_AUTOCHECKPOINT,
+    },
+}
+
+# Memória por banco (perfil "wal"): cache de páginas em KiB (negativo) e mmap
+DB_MEMORY_PRAGMAS = {
+    # Usuários: poucas linhas, muito lido (login, autores, perfis)
+    USERS_DB: {"cache_size": -8000, "mmap_size": 32 * 1024 * 1024},
+    # Posts: espelho da API inteiro, lido a cada página do feed
+    POSTS_DB: {"cache_size": -16000, "mmap_size": 128 * 1024 * 1024},
+}
+
+
+def in_chunks(values, size: int = MAX_PARAMS):
+    """
+    Divide `values` em lotes de até MAX_PARAMS para consultas com `IN (...)`.
+    Gera (lote, placeholders), ex: ([1, 2], "?, ?").
+    """
+    values = list(values)
+    for start in range(0, len(values), size):
+        chunk = values[start : start + size]
+        yield chunk, ", ".join("?" * len(chunk))
+
+
+def storage_pragmas(path: str, profile: str = None) -> dict:
+    """Pragmas aplicados em cada conexão nova de `path` no perfil dado."""
+    profile = profile or DB_STORAGE_PROFILE
+    if profile not in STORAGE_PROFILES:
+        logging.warning(f"sqlite: perfil '{profile}' desconhecido, usando 'wal'")
+        profile = "wal"
+    pragmas = dict(STORAGE_PROFILES[profile])
+    if profile != "legacy":
+        pragmas.update(DB_MEMORY_PRAGMAS.get(path, {}))
+    return pragmas
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    """Nenhuma conexão ficou livre dentro de DB_TIMEOUT."""
+
+
+class ConnectionPool:
+    """
+    Pool de conexões SQLite de um arquivo de banco.
+
+    Cada conexão é usada por uma thread de cada vez (emprestada dentro de um
+    `with`), então pode ser reaproveitada entre threads com
+    `check_same_thread=False`. Reaproveitar a conexão também reaproveita os
+    statements já preparados (`cached_statements`).
+
+    Detecção de vazamentos: cada empréstimo guarda o arquivo/linha de quem
+    pediu; empréstimos mais longos que DB_LEAK_SECONDS são registrados no log,
+    e uma conexão devolvida com transação aberta (sem commit) sofre rollback.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        readonly: bool = False,
+        profile: str = None,
+        attach=(),
+    ):
+        self.path = path
+        self.size = size
+        self.readonly = readonly
+        self.attach = tuple(attach)  # ((apelido, caminho), ...) para ATTACH DATABASE
+        self.pragmas = storage_pragmas(path, profile)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._in_use = {}  # id(conexão) -> (início, quem pediu)
+        self._reported = set()  # Vazamentos já registrados no log
+        self._pid = os.getpid()
+        self.counters = defaultdict(int)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=DB_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        for alias, path in self.attach:
+            conn.execute("ATTACH DATABASE ? AS ?", (path, alias))
+        if self.readonly:
+            conn.execute("PRAGMA query_only = ON")
+        self.counters["opened"] += 1
+        return conn
+
+    def _reset_after_fork(self):
+        # Conexões abertas antes de um fork (ex: gunicorn --preload) não
+        # podem ser usadas pelo processo filho: começa um pool novo
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = []
+            self._in_use = {}
+            self._reported = set()
+            self._slots = threading.BoundedSemaphore(self.size)
+
+    def _acquire(self, caller: str):
+        with self._lock:
+            self._reset_after_fork()
+            slots = self._slots
+
+        if not slots.acquire(blocking=False):
+            self.counters["waits"] += 1
+            self.check_leaks()
+            if not slots.acquire(timeout=DB_TIMEOUT):
+                self.counters["timeouts"] += 1
+                raise PoolTimeout(
+                    f"pool de {self.path} esgotado ({self.size} conexões em uso)"
+                )
+
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                slots.release()
+                raise
+        else:
+            self.counters["reused"] += 1
+
+        with self._lock:
+            self._in_use[id(conn)] = (time.monotonic(), caller)
+        return conn, slots
+
+    def _release(self, conn: sqlite3.Connection, slots):
+        if conn.in_transaction:
+            # Escrita sem commit: desfaz para não vazar a transação (e o lock
+            # de escrita) para o próximo usuário da conexão
+            conn.rollback()
+            self.counters["rollbacks"] += 1
+
+        with self._lock:
+            _, caller = self._in_use.pop(id(conn), (None, None))
+            if id(conn) in self._reported:
+                self._reported.discard(id(conn))
+                logging.warning(
+                    f"sqlite: conexão de {self.path} emprestada por {caller} foi devolvida"
+                )
+            if slots is self._slots:
+                self._idle.append(conn)
+            else:
+                conn.close()  # Conexão de antes de um fork
+        slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Empresta uma conexão do pool e a devolve ao sair do `with`."""
+        conn, slots = self._acquire(_caller())
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._release(conn, slots)
+
+    def check_leaks(self) -> list:
+        """Registra (uma vez) e retorna os empréstimos mais longos que DB_LEAK_SECONDS."""
+        now = time.monotonic()
+        leaks = []
+        with self._lock:
+            for conn_id, (since, caller) in self._in_use.items():
+                held = now - since
+                if held < DB_LEAK_SECONDS:
+                    continue
+                leaks.append({"caller": caller, "held_seconds": round(held, 1)})
+                if conn_id not in self._reported:
+                    self._reported.add(conn_id)
+                    self.counters["leaks"] += 1
+                    logging.warning(
+                        f"sqlite: conexão de {self.path} presa há {held:.0f}s por {caller}"
+                    )
+        return leaks
+
+    def close_all(self):
+        """Fecha as conexões ociosas (as emprestadas são fechadas ao voltar)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._slots = threading.BoundedSemaphore(self.size)
+        for conn in idle:
+            conn.close()
+
+    def metrics(self) -> dict:
+        leaks = self.check_leaks()
+        with self._lock:
+            return {
+                **self.counters,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "size": self.size,
+                "held_too_long": leaks,
+            }
+
+
+# Arquivos que só repassam conexões do pool (contextlib, este módulo e
+# wrappers como unit_of_work.py): o "dono" de um empréstimo é o primeiro
+# frame fora deles
+_WRAPPER_FILES = {os.path.abspath(__file__), os.path.abspath(contextlib.__file__)}
+
+
+def register_pool_wrapper(filename: str):
+    """Marca `filename` como wrapper do pool nos relatórios de vazamento."""
+    _WRAPPER_FILES.add(os.path.abspath(filename))
+
+
+def _caller() -> str:
+    """`arquivo:linha` de quem pediu a conexão (para os relatórios de vazamento)."""
+    frame = sys._getframe(1)
+    while (
+        frame is not None
+        and os.path.abspath(frame.f_code.co_filename) in _WRAPPER_FILES
+    ):
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: str, readonly: bool = False, attach=()) -> ConnectionPool:
+    key = (path, readonly, tuple(attach))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            size = DB_POOL_SIZE if readonly else DB_WRITE_POOL_SIZE
+            pool = _pools[key] = ConnectionPool(path, size, readonly, attach=attach)
+        return pool
+
+
+def connect(path: str, readonly: bool = False, attach=()):
+    """
+    Conexão emprestada do pool de `path`:
+
+        with connect(USERS_DB, readonly=True) as banco:
+            banco.execute(...)
+
+    Escritas precisam de `banco.commit()`; o que não for confirmado até o
+    fim do `with` (ou se uma exceção escapar) sofre rollback.
+    """
+    return get_pool(path, readonly, attach).connection()
+
+
+def users_db(readonly: bool = False):
+    """Conexão com usuarios.db (BANCO_DB)."""
+    return connect(USERS_DB, readonly)
+
+
+def posts_db(readonly: bool = False):
+    """Conexão com banco_posts_comunidade.db (BANCO_POST)."""
+    return connect(POSTS_DB, readonly)
+
+
+def feed_db():
+    """
+    Conexão somente leitura com usuarios.db e o banco de posts anexado como
+    `posts`: permite juntar posts, comentários e `user_card` em uma consulta.
+    """
+    return connect(USERS_DB, readonly=True, attach=(("posts", POSTS_DB),))
+
+
+def wal_size(path: str) -> int:
+    try:
+        return os.path.getsize(path + "-wal")
+    except OSError:
+        return 0
+
+
+class Checkpointer:
+    """
+    Checkpoint do WAL em segundo plano para os bancos com pool de escrita.
+
+    Uma thread por processo (iniciada por `start()`, como a das notícias)
+    roda `PRAGMA wal_checkpoint` em cada banco a cada `interval` segundos e
+    guarda o tamanho do -wal e a latência de cada checkpoint para as métricas.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pid = None
+        self.stats = defaultdict(lambda: defaultdict(int))
+
+    def start(self):
+        if DB_STORAGE_PROFILE == "legacy" or self.interval <= 0:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(
+            target=self._run, name="sqlite-checkpoint", daemon=True
+        ).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.run_once()
+
+    def run_once(self):
+        with _pools_lock:
+            paths = {
+                path
+                for (path, readonly, _), pool in _pools.items()
+                if not readonly and pool.pragmas.get("journal_mode") == "WAL"
+            }
+        for path in sorted(paths):
+            try:
+                self.checkpoint(path)
+            except sqlite3.Error as erro:
+                logging.error(
+                    f"sqlite: checkpoint de {path} falhou: {erro.__class__.__name__}: {erro}"
+                )
+
+    def checkpoint(self, path: str):
+        mode = "TRUNCATE" if wal_size(path) > DB_WAL_TRUNCATE_BYTES else "PASSIVE"
+        start = time.perf_counter()
+        with connect(path) as banco:
+            busy, wal_pages, checkpointed = banco.execute(
+                f"PRAGMA wal_checkpoint({mode})"
+            ).fetchone()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            stats = self.stats[path]
+            stats["checkpoints"] += 1
+            stats["busy"] += busy  # Leitores impediram o checkpoint completo
+            stats["truncates"] += mode == "TRUNCATE"
+            stats["last_ms"] = round(elapsed_ms, 2)
+            stats["max_ms"] = round(max(stats["max_ms"], elapsed_ms), 2)
+            stats["last_wal_pages"] = wal_pages
+            stats["last_checkpointed_pages"] = checkpointed
+
+    def metrics(self) -> dict:
+        with _pools_lock:
+            paths = {path for path, readonly, _ in _pools if not readonly}
+        with self._lock:
+            return {
+                os.path.basename(path): {
+                    **self.stats.get(path, {}),
+                    "wal_bytes": wal_size(path),
+                }
+                for path in sorted(paths)
+            }
+
+
+checkpointer = Checkpointer(DB_CHECKPOINT_INTERVAL)
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+def pool_metrics() -> dict:
+    with _pools_lock:
+        pools = dict(_pools)
+    return {
+        os.path.basename(path)
+        + "".join(f"+{alias}" for alias, _ in attach)
+        + (":ro" if readonly else ""): pool.metrics()
+        for (path, readonly, attach), pool in pools.items()
+    }
@@ -0,0 +1,132 @@
+import json
+
+from application.src.database.conexao import feed_db
+
+# Um post por linha, já com o card do autor e os comentários (cada um com o
+# card de quem comentou) agregados em JSON. Tudo em uma consulta sobre
+# usuarios.db + banco de posts anexado (`posts`):
+#   - autor: pelo `nome` do post, como nos cards; nomes repetidos ficam com
+#     o menor id (idx_user_card_name)
+#   - comentários: idx_comentario_espelho_post percorre os comentários de
+#     cada post; o ORDER BY rowid (ordem de gravação, como no espelho) fica
+#     na subconsulta interna, porque o json_group_array do SQLite anterior
+#     à 3.44 não aceita ORDER BY próprio
+FEED_SELECT = """
+    SELECT p.id, p.user_id, p.nome, p.titulo, p.post, p.likes, p.img_url, p.data,
+           autor.id, autor.username, autor.occupation, autor.photo,
+           (
+               SELECT json_group_array(json(comentario))
+               FROM (
+                   SELECT json_object(
+                       'comment_id', cm.comment_id,
+                       'user_id', cm.user_id,
+                       'comment', cm.comment,
+                       'creation_date', cm.creation_date,
+                       'autor_id', quem.id,
+                       'autor_nome', quem.name,
+                       'autor_foto', quem.photo
+                   ) AS comentario
+                   FROM posts.comentario_espelho AS cm
+                   LEFT JOIN user_card AS quem ON quem.id = cm.user_id
+                   WHERE cm.post_id = p.id
+                   ORDER BY cm.rowid
+               )
+           ) AS comentarios
+    FROM posts.post_espelho AS p
+    LEFT JOIN user_card AS autor ON autor.id = (
+        SELECT id FROM user_card WHERE name = p.nome ORDER BY id LIMIT 1
+    )
+"""
+
+
+class FeedDAO:
+    """
+    Leituras do feed e do perfil que juntam posts e usuários no SQLite.
+
+    Retorna os posts no formato da API (com `comments`) mais os dados dos
+    autores e de quem comentou, prontos para `user_service.hydrate_posts`,
+    sem consultas extras nem junção em Python.
+    """
+
+    def _query(self, where: str = "", params=(), limit: int = None):
+        sql = f"{FEED_SELECT} {where} ORDER BY p.id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+
+        with feed_db() as banco:
+            rows = banco.execute(sql, params).fetchall()
+
+        posts, authors, commenters = [], {}, {}
+        for (
+            post_id,
+            user_id,
+            nome,
+            titulo,
+            post,
+            likes,
+            img_url,
+            data,
+            author_id,
+            username,
+            occupation,
+            photo,
+            comentarios,
+        ) in rows:
+            if author_id is not None:
+                authors.setdefault(
+                    nome,
+                    {
+                        "photo": photo,
+                        "username": username,
+                        "occupation": occupation,
+                    },
+                )
+
+            comments = []
+            for comment in json.loads(comentarios or "[]"):
+                commenter_id = comment.pop("autor_id")
+                if commenter_id is not None:
+                    commenters[commenter_id] = {
+                        "id": commenter_id,
+                        "username": comment["autor_nome"],
+                        "photo": comment["autor_foto"]
+                        or "icon/default.svg",  # Foto padrão
+                    }
+                del comment["autor_nome"], comment["autor_foto"]
+                comments.append(comment)
+
+            posts.append(
+                {
+                    "id": post_id,
+                    "user_id": user_id,
+                    "nome": nome,
+                    "titulo": titulo,
+                    "post": post,
+                    "likes": likes,
+                    "img_url": img_url,
+                    "data": data,
+                    "comments": comments,
+                }
+            )
+        return posts, authors, commenters
+
+    def page(self, cursor: int = None, limit: int = 20):
+        """Keyset como `post_mirror.page`: (posts, autores, comentaristas, next_cursor)."""
+        if cursor is None:
+            posts, authors, commenters = self._query(limit=limit + 1)
+        else:
+            posts, authors, commenters = self._query(
+                "WHERE p.id < ?", (cursor,), limit=limit + 1
+            )
+        has_more = len(posts) > limit
+        posts = posts[:limit]
+        next_cursor = posts[-1]["id"] if posts and has_more else None
+        return posts, authors, commenters, next_cursor
+
+    def user_posts(self, user_id: int):
+        """Posts de um usuário (idx_post_espelho_user): (posts, autores, comentaristas)."""
+        return self._query("WHERE p.user_id = ?", (user_id,))
+
+
+feed_dao = FeedDAO()
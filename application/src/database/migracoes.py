@@ -0,0 +1,278 @@
+"""
+Migrações do esquema dos dois bancos, versionadas por `PRAGMA user_version`.
+
+Cada banco tem uma lista ordenada de migrações (versão, descrição, função).
+No boot, `run_migrations()` lê a versão de cada banco (uma leitura) e só
+quando ela está atrás da última migração abre uma transação
+`BEGIN IMMEDIATE`: o lock de escrita faz os workers que sobem ao mesmo tempo
+esperarem um pelo outro, e quem entra depois relê a versão e não reaplica
+nada. Migração nova = função nova no fim da lista, nunca editar uma antiga.
+
+Também roda pela linha de comando (ex: antes de subir os workers):
+
+    python -m application.src.database.migracoes
+"""
+
+import logging
+
+from application.src.database.conexao import POSTS_DB, USERS_DB, connect
+
+
+def _add_missing_columns(banco, table: str, columns: dict):
+    """
+    ALTER TABLE apenas para as colunas que faltam: bancos anteriores às
+    migrações podem já ter parte delas (o antigo `add_column()` do boot).
+    """
+    existing = {row[1] for row in banco.execute(f"PRAGMA table_info({table})")}
+    for name, definition in columns.items():
+        if name not in existing:
+            banco.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+# usuarios.db ---------------------------------------------------------------
+
+
+def _users_tables(banco):
+    banco.execute(
+        """CREATE TABLE IF NOT EXISTS usuarios(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date_create TEXT DEFAULT (datetime('now', 'localtime')),
+        name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        age INTEGER,
+        password TEXT NOT NULL,
+        photo TEXT DEFAULT 'application/src/static/uploads/1.jpg',
+        github TEXT NULL,
+        likedin TEXT NULL,
+        site TEXT NULL
+        )"""
+    )
+
+    # `user_information` tem o mesmo ID da tabela `usuarios`
+    banco.execute(
+        """CREATE TABLE IF NOT EXISTS user_information(
+        id INTEGER PRIMARY KEY,  -- Mesmo ID da tabela `usuarios`
+        name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        username TEXT UNIQUE NOT NULL,
+        occupation TEXT NULL,
+        FOREIGN KEY (id) REFERENCES usuarios (id) ON DELETE CASCADE
+        )"""
+    )
+
+
+def _users_profile_columns(banco):
+    _add_missing_columns(
+        banco,
+        "usuarios",
+        {
+            "bio": "TEXT",
+            "followers": "INTEGER DEFAULT 0",
+            "following": "INTEGER DEFAULT 0",
+            "banner": "TEXT",  # banner de perfil do usuario
+            "is_first_login": "BOOLEAN DEFAULT 1",
+        },
+    )
+
+
+def _users_name_indexes(banco):
+    # Autores do feed, perfil por nome e configurações buscam por `name`
+    banco.execute("CREATE INDEX IF NOT EXISTS idx_usuarios_name ON usuarios (name)")
+    banco.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_information_name ON user_information (name)"
+    )
+
+
+def _users_card(banco):
+    # Projeção desnormalizada de `usuarios` + `user_information` com só o
+    # que os cards do feed mostram (autor e comentários). Mantida pelas
+    # escritas (configure_users.refresh_user_card); aqui só o backfill.
+    banco.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_card (
+            id INTEGER PRIMARY KEY,  -- usuarios.id
+            name TEXT NOT NULL,  -- usuarios.name (o `nome` dos posts)
+            username TEXT NULL,  -- user_information.username
+            occupation TEXT NULL,
+            photo TEXT NULL
+        )
+        """
+    )
+    banco.execute("CREATE INDEX IF NOT EXISTS idx_user_card_name ON user_card (name)")
+    # Liga as duas tabelas pelo email (único nas duas): `user_information.id`
+    # nem sempre acompanha o id de `usuarios`
+    banco.execute(
+        """
+        INSERT OR REPLACE INTO user_card (id, name, username, occupation, photo)
+        SELECT usuarios.id, usuarios.name, user_information.username,
+               user_information.occupation, usuarios.photo
+        FROM usuarios
+        LEFT JOIN user_information ON user_information.email = usuarios.email
+        """
+    )
+
+
+def _users_follow_graph(banco):
+    # Arestas do grafo de seguidores (database/users/follow_graph.py). A
+    # chave primária atende "quem X segue" e o índice inverso "quem segue X"
+    banco.execute(
+        """
+        CREATE TABLE IF NOT EXISTS seguidores (
+            follower_id INTEGER NOT NULL,  -- quem segue (usuarios.id)
+            followed_id INTEGER NOT NULL,  -- quem é seguido (usuarios.id)
+            created_at TEXT DEFAULT (datetime('now', 'localtime')),
+            PRIMARY KEY (follower_id, followed_id)
+        ) WITHOUT ROWID
+        """
+    )
+    banco.execute(
+        "CREATE INDEX IF NOT EXISTS idx_seguidores_followed ON seguidores (followed_id, follower_id)"
+    )
+    # Os contadores passam a refletir as arestas (até aqui não havia nenhuma)
+    banco.execute(
+        """
+        UPDATE usuarios SET
+            followers = (SELECT COUNT(*) FROM seguidores WHERE followed_id = usuarios.id),
+            following = (SELECT COUNT(*) FROM seguidores WHERE follower_id = usuarios.id)
+        """
+    )
+
+
+USERS_MIGRATIONS = [
+    (1, "tabelas usuarios e user_information", _users_tables),
+    (
+        2,
+        "colunas de perfil (bio, seguidores, banner, primeiro login)",
+        _users_profile_columns,
+    ),
+    (3, "índices por nome", _users_name_indexes),
+    (4, "tabela user_card (cards do feed)", _users_card),
+    (5, "grafo de seguidores", _users_follow_graph),
+]
+
+
+# banco_posts_comunidade.db -------------------------------------------------
+
+
+def _posts_table(banco):
+    banco.execute(
+        """
+        CREATE TABLE IF NOT EXISTS post_do_usuario (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            img_path TEXT NULL,  -- Permite que o campo img_path seja NULL
+            data TEXT DEFAULT (datetime('now', 'localtime'))
+        )
+        """
+    )
+
+
+def _posts_mirror(banco):
+    # Espelho local dos posts e comentários da API (services/post_mirror.py)
+    banco.execute(
+        """
+        CREATE TABLE IF NOT EXISTS post_espelho (
+            id INTEGER PRIMARY KEY,  -- Mesmo ID da API
+            user_id INTEGER,
+            nome TEXT,
+            titulo TEXT,
+            post TEXT,
+            likes INTEGER DEFAULT 0,
+            img_url TEXT NULL,
+            data TEXT,
+            versao TEXT NOT NULL  -- Hash do post na API, para detectar mudanças
+        )
+        """
+    )
+    banco.execute(
+        "CREATE INDEX IF NOT EXISTS idx_post_espelho_user ON post_espelho (user_id, id)"
+    )
+    # Post em destaque
+    banco.execute(
+        "CREATE INDEX IF NOT EXISTS idx_post_espelho_likes ON post_espelho (likes, id)"
+    )
+
+    banco.execute(
+        """
+        CREATE TABLE IF NOT EXISTS comentario_espelho (
+            post_id INTEGER NOT NULL,
+            comment_id INTEGER NULL,  -- comment_id da API
+            user_id INTEGER,
+            comment TEXT,
+            creation_date TEXT
+        )
+        """
+    )
+    banco.execute(
+        "CREATE INDEX IF NOT EXISTS idx_comentario_espelho_post ON comentario_espelho (post_id)"
+    )
+
+    banco.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sincronizacao (
+            fonte TEXT PRIMARY KEY,
+            cursor INTEGER NOT NULL DEFAULT 0,  -- Maior id de post já sincronizado
+            atualizado_em TEXT DEFAULT (datetime('now', 'localtime'))
+        )
+        """
+    )
+
+
+POSTS_MIGRATIONS = [
+    (1, "tabela post_do_usuario", _posts_table),
+    (2, "espelho dos posts da API", _posts_mirror),
+]
+
+
+MIGRATIONS = {
+    USERS_DB: USERS_MIGRATIONS,
+    POSTS_DB: POSTS_MIGRATIONS,
+}
+
+
+def schema_version(banco) -> int:
+    return banco.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(path: str, migrations: list) -> int:
+    """Aplica as migrações pendentes de `path`. Retorna a versão final."""
+    latest = migrations[-1][0] if migrations else 0
+
+    with connect(path) as banco:
+        current = schema_version(banco)
+        if current >= latest:
+            return current  # Caso comum no boot: uma única leitura
+
+        # Lock de escrita: outro worker migrando ao mesmo tempo espera aqui
+        # (até DB_TIMEOUT) e depois encontra a versão já atualizada
+        banco.execute("BEGIN IMMEDIATE")
+        try:
+            current = schema_version(banco)
+            for version, description, apply in migrations:
+                if version <= current:
+                    continue
+                apply(banco)
+                banco.execute(f"PRAGMA user_version = {int(version)}")
+                logging.info(f"migração {path} v{version}: {description}")
+                current = version
+            banco.commit()
+        except Exception:
+            banco.rollback()
+            logging.critical(
+                f"migração de {path} falhou na v{current + 1}", exc_info=True
+            )
+            raise
+
+    return current
+
+
+def run_migrations() -> dict:
+    """Migra os dois bancos. Retorna {banco: versão}."""
+    return {path: migrate(path, migrations) for path, migrations in MIGRATIONS.items()}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    for path, version in run_migrations().items():
+        logging.info(f"{path}: versão {version}")
@@ -0,0 +1,69 @@
+"""
+Unidade de trabalho: várias escritas relacionadas em uma única transação.
+
+    with unit_of_work(USERS_DB) as uow:
+        user_id = uow.insert("INSERT INTO usuarios (...) VALUES (...)", params)
+        uow.execute("UPDATE ... WHERE id = ?", (user_id,))
+        uow.publish(PROFILE_UPDATED, user_id=user_id)
+
+A transação abre com `BEGIN IMMEDIATE` (o lock de escrita é pego logo no
+início, então uma leitura seguida de escrita nunca falha no meio com
+"database is locked") e faz um único commit (um fsync) na saída do `with`.
+Se uma exceção escapar, tudo sofre rollback e nada é publicado: os eventos
+de invalidação só saem depois do commit, com a conexão já devolvida ao pool.
+"""
+
+from contextlib import contextmanager
+
+from application.src.database.conexao import (
+    POSTS_DB,
+    USERS_DB,
+    connect,
+    register_pool_wrapper,
+)
+from application.src.services.invalidation import bus
+
+# Vazamentos apontam para quem abriu a unidade, não para este módulo
+register_pool_wrapper(__file__)
+
+
+class UnitOfWork:
+    def __init__(self, banco):
+        self.banco = banco
+        self.events = []  # (evento, payload) publicados após o commit
+
+    def execute(self, sql: str, params=()):
+        return self.banco.execute(sql, params)
+
+    def insert(self, sql: str, params=()) -> int:
+        """INSERT que retorna o id gerado (`lastrowid`)."""
+        return self.banco.execute(sql, params).lastrowid
+
+    def returning(self, sql: str, params=()):
+        """Escrita com `RETURNING`: retorna a primeira linha (ou None)."""
+        return self.banco.execute(sql, params).fetchone()
+
+    def publish(self, event: str, **payload):
+        self.events.append((event, payload))
+
+
+@contextmanager
+def unit_of_work(path: str):
+    with connect(path) as banco:
+        banco.execute("BEGIN IMMEDIATE")
+        uow = UnitOfWork(banco)
+        yield uow  # Exceção aqui: o pool faz o rollback
+        banco.commit()
+
+    for event, payload in uow.events:
+        bus.publish(event, **payload)
+
+
+def users_unit():
+    """Unidade de trabalho em usuarios.db (BANCO_DB)."""
+    return unit_of_work(USERS_DB)
+
+
+def posts_unit():
+    """Unidade de trabalho em banco_posts_comunidade.db (BANCO_POST)."""
+    return unit_of_work(POSTS_DB)
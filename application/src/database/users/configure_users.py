@@ -1,103 +1,87 @@
 import sqlite3
-from flask_login import UserMixin
+
 from flask_bcrypt import check_password_hash, generate_password_hash
-from application.src.models.modelsUser import (Cadastro, Login, Links, UserInformation)
-
-
-
-    
-def my_db():
-    banco = sqlite3.connect('usuarios.db')
-    return banco, banco.cursor()
-
-def create_database():
-    banco, cursor = my_db()
-    cursor.execute(
-        '''CREATE TABLE IF NOT EXISTS usuarios(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        date_create TEXT DEFAULT (datetime('now', 'localtime')),
-        name TEXT NOT NULL,
-        last_name TEXT NOT NULL,
-        email TEXT UNIQUE NOT NULL,
-        age INTEGER,
-        password TEXT NOT NULL,
-        photo TEXT DEFAULT 'application/src/static/uploads/1.jpg',
-        github TEXT NULL,
-        likedin TEXT NULL,
-        site TEXT NULL
-        )'''
-    )
-   
-
-     # Criação da tabela `user_information` com relação ao `usuarios`
-     # Essas duas TABELAS devem continua tendo relação com o id , para buscar as infor do usuario etc..
-    cursor.execute(
-        '''CREATE TABLE IF NOT EXISTS user_information(
-        id INTEGER PRIMARY KEY,  -- Mesmo ID da tabela `usuarios`
-        name TEXT NOT NULL,
-        email TEXT UNIQUE NOT NULL,
-        username TEXT UNIQUE NOT NULL,
-        occupation TEXT NULL,
-        FOREIGN KEY (id) REFERENCES usuarios (id) ON DELETE CASCADE
-        )'''
-    )
-    banco.commit()
-    banco.close()
-    
+from flask_login import UserMixin
+
+from application.src.database.conexao import users_db
+from application.src.database.unit_of_work import users_unit
+from application.src.models.modelsUser import Cadastro, Links, Login, UserInformation
+from application.src.services.invalidation import PROFILE_UPDATED
+
+
+def refresh_user_card(banco, user_id: int = None, email: str = None):
+    """
+    Regrava a linha de `user_card` (projeção de `usuarios` + `user_information`
+    usada pelos cards do feed) de um usuário, por id ou email. Deve rodar na
+    mesma transação da escrita que mudou nome, username, ocupação ou foto.
+    Retorna o id do usuário (None se não existir).
+    """
+    column, value = ("id", user_id) if user_id is not None else ("email", email)
+    row = banco.execute(f'''
+    INSERT INTO user_card (id, name, username, occupation, photo)
+    SELECT usuarios.id, usuarios.name, user_information.username,
+           user_information.occupation, usuarios.photo
+    FROM usuarios
+    LEFT JOIN user_information ON user_information.email = usuarios.email
+    WHERE usuarios.{column} = ?
+    ON CONFLICT(id) DO UPDATE SET
+        name = excluded.name,
+        username = excluded.username,
+        occupation = excluded.occupation,
+        photo = excluded.photo
+    RETURNING id
+    ''', (value,)).fetchone()
+    return row[0] if row else None
+
+
 def add_user(cadastro: Cadastro):
-    banco, cursor = my_db()
-    
+    """
+    Cria a conta (`usuarios` + `user_card`) em uma transação.
+    Retorna o id do novo usuário, ou None se não foi possível criar.
+    """
+    # Gerar o hash da senha (fora da transação: o bcrypt é lento)
+    senha_hash = generate_password_hash(cadastro.password).decode('utf-8')
     try:
-        # Gerar o hash da senha
-        senha_hash = generate_password_hash(cadastro.password).decode('utf-8')
-        
-        # Inserir na tabela `usuarios`
-        cursor.execute('''
-        INSERT INTO usuarios (name, last_name, email, age, password)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (cadastro.name, cadastro.last_name, cadastro.email, cadastro.age, senha_hash))
-        
-        # Confirmar as transações
-        banco.commit()
-    
-    except Exception as e:
-        banco.rollback()
+        with users_unit() as uow:
+            # Inserir na tabela `usuarios`
+            user_id = uow.insert('''
+            INSERT INTO usuarios (name, last_name, email, age, password)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (cadastro.name, cadastro.last_name, cadastro.email, cadastro.age, senha_hash))
+            refresh_user_card(uow.banco, user_id=user_id)
+    except sqlite3.Error as e:
         print(f"Erro ao adicionar usuário: {e}")
-    
-    finally:
-        banco.close()
+        return None
+    return user_id
 
 
 def add_user_information(user: UserInformation):
-    banco, cursor = my_db()
-    
+    """
+    Segunda etapa do cadastro: `user_information` + `user_card` em uma
+    transação. Retorna o id do usuário, ou None se não foi possível salvar.
+    """
     try:
-        # Inserir na tabela `user_information`
-        cursor.execute('''
-        INSERT INTO user_information (name, username, email, occupation)
-        VALUES (?, ?, ?, ?)
-        ''', (user.name, user.username, user.email, user.occupation))
-        
-        # Confirmar as transações
-        banco.commit()
-        print("Usuário adicionado com sucesso!")
-        print("Usuário adicionado com sucesso!")
-    
-    except Exception as e:
-        banco.rollback()
+        with users_unit() as uow:
+            # Inserir na tabela `user_information`
+            uow.execute('''
+            INSERT INTO user_information (name, username, email, occupation)
+            VALUES (?, ?, ?, ?)
+            ''', (user.name, user.username, user.email, user.occupation))
+            user_id = refresh_user_card(uow.banco, email=user.email)
+            uow.publish(PROFILE_UPDATED, user_id=user_id, name=user.name)
+    except sqlite3.Error as e:
         print(f"Erro ao adicionar informações do usuário: {e}")
-    
-    finally:
-        banco.close()
+        return None
+
+    print("Usuário adicionado com sucesso!")
+    return user_id
 
 
 def check_user_login(login: Login):
-    banco, cursor = my_db()
-    cursor.execute('''
-    SELECT id, name, password FROM usuarios WHERE email = ?
-    ''', (login.email,))
-    user = cursor.fetchone()
-    banco.close()
+    with users_db(readonly=True) as banco:
+        user = banco.execute('''
+        SELECT id, name, password FROM usuarios WHERE email = ?
+        ''', (login.email,)).fetchone()
 
     if user:
         user_id, username, hashed_password = user
@@ -107,72 +91,20 @@ def check_user_login(login: Login):
     return False, None, None, None
 
 
-# Função para adicionar a coluna 'bio' se não existir
-# add column e usada para cria novas coluunas teste, para não precisar excluir o banco
-def add_column():
-    banco, cursor = my_db()
-    
-    # Verifica se a coluna 'bio' já existe
-    cursor.execute("PRAGMA table_info(usuarios)")
-    columns = [column[1] for column in cursor.fetchall()]  # Obtém todos os nomes das colunas
-
-    if 'bio' not in columns:
-        # Adiciona a coluna 'bio' à tabela 'usuarios'
-        cursor.execute("ALTER TABLE usuarios ADD COLUMN bio TEXT")
-        banco.commit()
-       
-    else:
-        pass
-    if 'followers' not in columns:
-        # add followers
-        cursor.execute("ALTER TABLE usuarios ADD COLUMN followers INTEGER DEFAULT 0")
-        banco.commit()
-
-    else:
-        pass
-
-    if 'following' not in columns:
-        # add following
-        cursor.execute("ALTER TABLE usuarios ADD COLUMN following INTEGER DEFAULT 0")
-        banco.commit()
-        
-    else:
-        pass
-
-    if 'banner' not in columns:
-        # banner de perfil do usuario
-        cursor.execute("ALTER TABLE usuarios ADD COLUMN banner TEXT")
-        banco.commit()
-    
-    else:
-        pass
-
-    if 'is_first_login' not in columns:
-        cursor.execute("ALTER TABLE usuarios ADD COLUMN is_first_login BOOLEAN DEFAULT 1")
-        banco.commit()
-    else:
-        pass
-
-   
-
-    banco.close()
-
 def link_of_user(link: Links, user_id: int):
-    banco, cursor = my_db()
     try:
-        # Atualiza os campos github, linkedin e site do usuário com o ID especificado
-        cursor.execute('''
-        UPDATE usuarios
-        SET github = ?, likedin = ?, site = ?
-        WHERE id = ?
-        ''', (link.github, link.linkedin, link.site, user_id))
-        banco.commit()
+        with users_unit() as uow:
+            # Atualiza os campos github, linkedin e site do usuário com o ID especificado
+            uow.execute('''
+            UPDATE usuarios
+            SET github = ?, likedin = ?, site = ?
+            WHERE id = ?
+            ''', (link.github, link.linkedin, link.site, user_id))
+            uow.publish(PROFILE_UPDATED, user_id=user_id)
     except sqlite3.IntegrityError as e:
         print(f"Erro ao salvar dados: {e}")
     except sqlite3.OperationalError as e:
         print(f"Erro ao acessar o banco de dados: {e}")
-    finally:
-        banco.close()
 
 
 
@@ -187,10 +119,8 @@ class User(UserMixin):
     def get(user_id):
         if not user_id:
             return None
-        banco, cursor = my_db()
-        cursor.execute('SELECT id, name, email FROM usuarios WHERE id = ?', (user_id,))
-        user = cursor.fetchone()
-        banco.close()
+        with users_db(readonly=True) as banco:
+            user = banco.execute('SELECT id, name, email FROM usuarios WHERE id = ?', (user_id,)).fetchone()
         if user:
             print(f'ID: {user[0]}, Username: {user[1]}, Email: {user[2]}')  # Verificando se os dados estão corretos
             return User(user_id=user[0], username=user[1], email=user[2])
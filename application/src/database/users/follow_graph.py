@@ -0,0 +1,177 @@
+import os
+
+from application.src.database.conexao import in_chunks, users_db
+from application.src.database.unit_of_work import users_unit
+from application.src.services.invalidation import PROFILE_UPDATED
+
+# Paginação das listas de seguidores / seguindo (?cursor=&limit=)
+FOLLOW_PAGE_SIZE = int(os.getenv("FOLLOW_PAGE_SIZE", 20))
+FOLLOW_MAX_PAGE_SIZE = int(os.getenv("FOLLOW_MAX_PAGE_SIZE", 100))
+# Primeira página: maior id possível no SQLite (sem cursor = do início)
+FIRST_PAGE = 2**63 - 1
+
+
+class FollowGraph:
+    """
+    Grafo de seguidores sobre a tabela `seguidores` (uma aresta por par
+    seguidor -> seguido) de usuarios.db.
+
+    Seguir e deixar de seguir são idempotentes: a aresta e os contadores
+    `usuarios.followers` / `usuarios.following` mudam na mesma transação,
+    só quando a aresta realmente foi criada ou removida, então os contadores
+    são lidos em O(1) pelo perfil sem COUNT(*). As listas usam keyset pelo
+    id do outro usuário, sempre por índice (PK ou idx_seguidores_followed).
+    """
+
+    def _counts(self, uow, follower_id: int, followed_id: int) -> dict:
+        followers = uow.execute(
+            "SELECT followers FROM usuarios WHERE id = ?", (followed_id,)
+        ).fetchone()
+        following = uow.execute(
+            "SELECT following FROM usuarios WHERE id = ?", (follower_id,)
+        ).fetchone()
+        return {
+            "followers": followers[0] if followers else 0,  # do seguido
+            "following_count": following[0] if following else 0,  # de quem segue
+        }
+
+    def follow(self, follower_id: int, followed_id: int):
+        """
+        `follower_id` passa a seguir `followed_id`. Retorna
+        {"following": True, "changed": bool, "followers": n, "following_count": n},
+        ou None se `followed_id` não existe.
+        """
+        if follower_id == followed_id:
+            raise ValueError("um usuário não pode seguir a si mesmo")
+
+        with users_unit() as uow:
+            exists = uow.execute(
+                "SELECT 1 FROM usuarios WHERE id = ?", (followed_id,)
+            ).fetchone()
+            if exists is None:
+                return None
+
+            changed = (
+                uow.execute(
+                    "INSERT OR IGNORE INTO seguidores (follower_id, followed_id) VALUES (?, ?)",
+                    (follower_id, followed_id),
+                ).rowcount
+                == 1
+            )
+            if changed:
+                uow.execute(
+                    "UPDATE usuarios SET following = following + 1 WHERE id = ?",
+                    (follower_id,),
+                )
+                uow.execute(
+                    "UPDATE usuarios SET followers = followers + 1 WHERE id = ?",
+                    (followed_id,),
+                )
+                uow.publish(PROFILE_UPDATED, user_id=follower_id)
+                uow.publish(PROFILE_UPDATED, user_id=followed_id)
+            counts = self._counts(uow, follower_id, followed_id)
+
+        return {**counts, "following": True, "changed": changed}
+
+    def unfollow(self, follower_id: int, followed_id: int):
+        """Desfaz `follow`. Mesmo retorno (com "following": False)."""
+        with users_unit() as uow:
+            exists = uow.execute(
+                "SELECT 1 FROM usuarios WHERE id = ?", (followed_id,)
+            ).fetchone()
+            if exists is None:
+                return None
+
+            changed = (
+                uow.execute(
+                    "DELETE FROM seguidores WHERE follower_id = ? AND followed_id = ?",
+                    (follower_id, followed_id),
+                ).rowcount
+                == 1
+            )
+            if changed:
+                uow.execute(
+                    "UPDATE usuarios SET following = MAX(following - 1, 0) WHERE id = ?",
+                    (follower_id,),
+                )
+                uow.execute(
+                    "UPDATE usuarios SET followers = MAX(followers - 1, 0) WHERE id = ?",
+                    (followed_id,),
+                )
+                uow.publish(PROFILE_UPDATED, user_id=follower_id)
+                uow.publish(PROFILE_UPDATED, user_id=followed_id)
+            counts = self._counts(uow, follower_id, followed_id)
+
+        return {**counts, "following": False, "changed": changed}
+
+    def _page(self, rows, limit: int):
+        has_more = len(rows) > limit
+        users = [
+            {
+                "id": user_id,
+                "name": name,
+                "username": username,
+                "photo": photo or "icon/default.svg",  # Foto padrão
+            }
+            for user_id, name, username, photo in rows[:limit]
+        ]
+        next_cursor = users[-1]["id"] if users and has_more else None
+        return users, next_cursor
+
+    def followers(
+        self, user_id: int, cursor: int = None, limit: int = FOLLOW_PAGE_SIZE
+    ):
+        """Quem segue `user_id` (idx_seguidores_followed). Retorna (usuarios, next_cursor)."""
+        with users_db(readonly=True) as banco:
+            rows = banco.execute(
+                """
+                SELECT s.follower_id, card.name, card.username, card.photo
+                FROM seguidores AS s
+                LEFT JOIN user_card AS card ON card.id = s.follower_id
+                WHERE s.followed_id = ? AND s.follower_id < ?
+                ORDER BY s.follower_id DESC
+                LIMIT ?
+                """,
+                (user_id, FIRST_PAGE if cursor is None else cursor, limit + 1),
+            ).fetchall()
+        return self._page(rows, limit)
+
+    def following(
+        self, user_id: int, cursor: int = None, limit: int = FOLLOW_PAGE_SIZE
+    ):
+        """Quem `user_id` segue (chave primária). Retorna (usuarios, next_cursor)."""
+        with users_db(readonly=True) as banco:
+            rows = banco.execute(
+                """
+                SELECT s.followed_id, card.name, card.username, card.photo
+                FROM seguidores AS s
+                LEFT JOIN user_card AS card ON card.id = s.followed_id
+                WHERE s.follower_id = ? AND s.followed_id < ?
+                ORDER BY s.followed_id DESC
+                LIMIT ?
+                """,
+                (user_id, FIRST_PAGE if cursor is None else cursor, limit + 1),
+            ).fetchall()
+        return self._page(rows, limit)
+
+    def follows_many(self, viewer_id, user_ids) -> set:
+        """
+        Quais de `user_ids` o `viewer_id` segue, com uma consulta por lote de
+        MAX_PARAMS (ex: os autores de uma página do feed).
+        """
+        ids = sorted({int(user_id) for user_id in user_ids if str(user_id).isdigit()})
+        followed = set()
+        if viewer_id is None or not ids:
+            return followed
+
+        with users_db(readonly=True) as banco:
+            for chunk, placeholders in in_chunks(ids):
+                rows = banco.execute(
+                    f"SELECT followed_id FROM seguidores WHERE follower_id = ? AND followed_id IN ({placeholders})",
+                    (int(viewer_id), *chunk),
+                ).fetchall()
+                followed.update(row[0] for row in rows)
+        return followed
+
+
+follow_graph = FollowGraph()
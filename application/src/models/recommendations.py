@@ -1,8 +1,9 @@
-from dotenv import load_dotenv
-import os
-import sqlite3
-import random
 import logging
+import random
+
+from dotenv import load_dotenv
+
+from application.src.database.conexao import users_db
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -30,12 +31,7 @@ def format_user_name(full_name):
 
 # Pegar todos os usuários e mostrar 0-10 no front como recomendação
 def recommendationsUser():
-    db_path = os.getenv('BANCO_DB', 'usuarios.db')  # Obtém o caminho do banco de dados
     try:
-        # Conecta ao banco de dados
-        banco = sqlite3.connect(db_path)
-        cursor = banco.cursor()
-
         # Define um limite aleatório
         limit = random.randint(2, 4)
 
@@ -46,8 +42,8 @@ def recommendationsUser():
         INNER JOIN user_information ON usuarios.id = user_information.id
         LIMIT {limit}
         """
-        cursor.execute(query)
-        get_information_user = cursor.fetchall()
+        with users_db(readonly=True) as banco:
+            get_information_user = banco.execute(query).fetchall()
 
         # Formata os dados para exibição
         recommendations = []
@@ -65,8 +61,6 @@ def recommendationsUser():
         return recommendations
 
     except Exception as e:
-        logging("Error when searching for users ", e.__class__.__class__)
+        logging.error(f"Error when searching for users {e.__class__.__name__}")
         return []
-    finally:
-        banco.close()  # Sempre feche a conexão ao terminar
 
@@ -1,4 +1,6 @@
 from application.src.services.api_service import dataRequests
+from application.src.services.feed_snapshot import get_feed_snapshot
+
 
 class SearchData:
     def __init__(self):
@@ -8,7 +10,7 @@ class SearchData:
 
     def Search(self, query: str):
         # Recupera todos os dados para pesquisa
-        data = self.PickingupDataForResearch()
+        data = self.PickingupDataForResearch(query)
 
         # Filtra os resultados que correspondem ao termo pesquisado
         matching_results = [
@@ -26,9 +28,10 @@ class SearchData:
         # Retorna os resultados como lista de dicionários
         return matching_results
 
-    def PickingupDataForResearch(self):
-        # Pega todos os dados da API
-        data = dataRequests()
+    def PickingupDataForResearch(self, query: str):
+        # Pré-filtra no espelho local (snapshot compartilhado da requisição) e
+        # formata apenas os posts candidatos
+        data = dataRequests(get_feed_snapshot().search(query))
         result = []
 
         # Processa os dados retornados da API
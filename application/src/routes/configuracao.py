@@ -1,16 +1,12 @@
-import sqlite3
-from flask_login import UserMixin
-from flask_bcrypt import check_password_hash, generate_password_hash
-from flask import render_template, Blueprint, redirect, flash, url_for, request, session
 import requests
-from datetime import datetime
-from flask_login import current_user, login_required
-from application.src.database.users.configure_users import my_db, Links, link_of_user
+from dotenv import load_dotenv
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+from flask_login import current_user
 
+from application.src.database.conexao import users_db
+from application.src.database.users.configure_users import Links, link_of_user
 from application.src.models.link_validators import validate_links
-from application.src.services.user_service import get_user_info, UserData
-import os
-from dotenv import load_dotenv
+from application.src.services.user_service import get_user_info
 
 configuracao_ = Blueprint('config', __name__, template_folder='templates')
 load_dotenv()
@@ -64,11 +60,8 @@ def config_account(usuario):
 
     try:
         
-        conn = sqlite3.connect(os.getenv("BANCO_DB"))
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, photo, email, bio, date_create, banner FROM usuarios WHERE name = ?', (usuario,))
-
-        user = cursor.fetchone()
+        with users_db(readonly=True) as conn:
+            user = conn.execute('SELECT id, photo, email, bio, date_create, banner FROM usuarios WHERE name = ?', (usuario,)).fetchone()
         user_photo = user[1]
         email_usuario = user[2]
         bio = user[3]
@@ -90,16 +83,10 @@ def config_account(usuario):
 
         status = "Conta Saudável" if usuario else "Sua conta está sendo verificada."
 
-
-        conn.close()
-
        
     except requests.exceptions.RequestException:
         flash("Erro ao carregar a página. Tente novamente mais tarde.", "error")
 
-    finally:
-        conn.close()
-
 
     return render_template('configuracao.html',  user_photo=user_photo, usuario=usuario, 
                            email_usuario=email_usuario, status=status, id_usuario=id_usuario,
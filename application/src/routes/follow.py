@@ -0,0 +1,50 @@
+from flask import Blueprint, jsonify, request
+from flask_login import current_user, login_required
+
+from application.src.database.users.follow_graph import (
+    FOLLOW_MAX_PAGE_SIZE,
+    FOLLOW_PAGE_SIZE,
+    follow_graph,
+)
+
+follow_ = Blueprint("follow", __name__)
+
+
+# Seguir (PUT/POST) e deixar de seguir (DELETE). Repetir a chamada não muda
+# nada: a resposta diz se algo mudou (`changed`) e os contadores atuais.
+@follow_.route("/devorbit/follow/<int:user_id>/", methods=["PUT", "POST", "DELETE"])
+@login_required
+def follow_user(user_id):
+    viewer_id = int(current_user.id)
+    if user_id == viewer_id:
+        return jsonify(error="Você não pode seguir a si mesmo."), 400
+
+    if request.method == "DELETE":
+        result = follow_graph.unfollow(viewer_id, user_id)
+    else:
+        result = follow_graph.follow(viewer_id, user_id)
+
+    if result is None:
+        return jsonify(error="Usuário não encontrado"), 404
+    return jsonify(user_id=user_id, **result)
+
+
+def page_args():
+    cursor = request.args.get("cursor", type=int)
+    limit = request.args.get("limit", FOLLOW_PAGE_SIZE, type=int)
+    return cursor, max(1, min(limit, FOLLOW_MAX_PAGE_SIZE))
+
+
+# Listas paginadas por keyset: ?cursor=<id do último usuário visto>&limit=
+@follow_.route("/devorbit/perfil/<int:user_id>/followers/")
+@login_required
+def followers_list(user_id):
+    users, next_cursor = follow_graph.followers(user_id, *page_args())
+    return jsonify(users=users, next_cursor=next_cursor)
+
+
+@follow_.route("/devorbit/perfil/<int:user_id>/following/")
+@login_required
+def following_list(user_id):
+    users, next_cursor = follow_graph.following(user_id, *page_args())
+    return jsonify(users=users, next_cursor=next_cursor)
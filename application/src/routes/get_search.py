@@ -1,11 +1,32 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify, request
+
 from application.src.models.search import SearchData
+from application.src.services.cache_generations import feed_generation
+from application.src.services.conditional import conditional
+from application.src.services.feed_snapshot import get_feed_snapshot
 
 query = Blueprint('search', __name__)
 
-@query.route('/search', methods=['POST'])
+
+def search_text():
+    """Termo pesquisado: corpo JSON no POST ou ?query= no GET."""
+    if request.method == 'POST':
+        return (request.get_json(silent=True) or {}).get('query', '')
+    return request.args.get('query', '')
+
+
+def search_version():
+    # O resultado só muda quando o feed muda (mesma geração -> mesmos posts)
+    get_feed_snapshot().revalidate()  # Sem esperar a API (ver feed_version)
+    return ("search", feed_generation(), search_text())
+
+
+# GET /search?query= pode ser guardado pelo navegador; no POST o front pode
+# reenviar o ETag recebido em If-None-Match e reaproveitar o resultado no 304
+@query.route('/search', methods=['GET', 'POST'])
+@conditional(search_version)
 def search():
-    query_text = request.json.get('query', '')
+    query_text = search_text()
     search_data = SearchData()
     results = search_data.Search(query_text)
 
@@ -1,95 +1,237 @@
 import logging
+import os
 import traceback
-import httpx
+from functools import partial
 
-from flask import Blueprint, redirect, render_template, request, url_for
+import httpx
+from flask import (
+    Blueprint,
+    Response,
+    g,
+    jsonify,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    stream_template,
+    url_for,
+)
 from flask_login import current_user, login_required
 
 from application.src.__main__ import cache
+from application.src.database.users.follow_graph import follow_graph
 from application.src.models.recommendations import recommendationsUser
-from application.src.utils.terminal import clear_terminal
-
 from application.src.services.api_noticias import (
     get_exact_count,
-    get_top_stories,
+    news_service,
 )
-from application.src.services.api_service import dataRequests
-from application.src.services.user_service import (
-    enrich_posts_with_user_info,
-    get_user_info,
+from application.src.services.cache_generations import (
+    FEED_CACHE_TTL,
+    feed_generation,
+    profile_generation,
 )
-
+from application.src.services.conditional import conditional
+from application.src.services.fanout import (
+    FANOUT_TIMEOUT_DB,
+    FANOUT_TIMEOUT_NEWS,
+    FANOUT_TIMEOUT_POSTS,
+    gather,
+)
+from application.src.services.feed_snapshot import (
+    FEED_MAX_PAGE_SIZE,
+    FEED_PAGE_SIZE,
+    get_feed_snapshot,
+)
+from application.src.services.user_service import get_user_info
+from application.src.utils.terminal import clear_terminal
 
 # Configuração do Blueprint
 home_ = Blueprint("home", __name__, template_folder="templates")
 
+# Envia o feed em partes (head/CSS primeiro, depois os cards) em vez de montar
+# a página inteira em memória. Opcional (FEED_STREAMING=1): respostas em
+# stream não entram no cache da view (`cacheable`), então com ele ligado a
+# primeira página do feed é renderizada de novo a cada requisição e o
+# FEED_CACHE_TTL não vale para ela.
+FEED_STREAMING = os.getenv("FEED_STREAMING", "0") == "1"
+# Tamanho mínimo (bytes) de cada parte enviada ao cliente
+FEED_STREAM_CHUNK = int(os.getenv("FEED_STREAM_CHUNK", 8192))
+
+
+def feed_version():
+    """
+    O que identifica uma versão da página do feed: quem vê, as gerações do
+    feed e do perfil, as notícias, o formato (HTML/JSON) e o caminho da
+    requisição. Qualquer escrita troca uma das gerações, e com ela a chave
+    do cache e o ETag.
+    """
+    # A geração do feed reflete o espelho atual; sem esperar a API aqui,
+    # posts novos trocam a geração quando a atualização terminar
+    get_feed_snapshot().revalidate()
+    return (
+        current_user.get_id(),
+        feed_generation(),
+        profile_generation(current_user.get_id()),
+        news_service.version,
+        "json" if wants_json() else "html",
+        request.full_path,
+    )
+
 
 @login_required
 def make_cache_key():
+    """Gera uma chave única de cache para cada usuário logado (ver `feed_version`)."""
+    return ":".join(str(part) for part in feed_version())
+
+
+def cacheable(response):
+    """
+    `response_filter` do cache: respostas em stream não podem ser guardadas
+    e páginas parciais (fonte do fan-out indisponível) não devem ser.
+    """
+    return not getattr(response, "is_streamed", False) and not g.get("partial_page")
+
+
+def buffered(chunks, size=FEED_STREAM_CHUNK):
+    """Agrupa os pedaços do Jinja em blocos de `size` bytes."""
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def render_page(template, **context):
+    """
+    Renderiza a página em stream (FEED_STREAMING) ou de uma vez.
+    Só deve ser chamada depois de todas as validações que podem virar
+    redirect: a partir daqui o status e os headers já foram decididos.
+    """
+    if not FEED_STREAMING:
+        return render_template(template, **context)
+    # stream_template já mantém o contexto da requisição durante o stream
+    return Response(buffered(stream_template(template, **context)), mimetype="text/html")
+
+
+def wants_json():
+    return (
+        request.args.get("format") == "json"
+        or request.accept_mimetypes.best_match(
+            ["text/html", "application/json"]
+        )
+        == "application/json"
+    )
+
+
+def load_feed_page(snapshot, cursor, limit, viewer_id=None):
     """
-    Gera uma chave única de cache para cada usuário logado.
-    Combina o ID do usuário e o caminho da requisição.
+    Busca, formata e enriquece apenas a página visível do feed.
+    Retorna (posts, next_cursor); posts é None se os dados vierem inválidos.
+    Cada post ganha `following`: se `viewer_id` segue o autor.
     """
-    return f"{current_user.id}:{request.path}"
+    # Posts, autores e quem comentou vêm juntos de uma consulta só (feed_dao)
+    posts, next_cursor = snapshot.page(cursor, limit)
+    if posts is None:
+        return None, next_cursor
+
+    # Uma consulta para todos os autores da página
+    followed = follow_graph.follows_many(viewer_id, (post.get("user_id") for post in posts))
+    for post in posts:
+        author_id = post.get("user_id")
+        post["following"] = str(author_id).isdigit() and int(author_id) in followed
+    return posts, next_cursor
 
 
 @home_.route("/devorbit/feed/", methods=["POST", "GET"])
-@cache.cached(timeout=100, key_prefix=make_cache_key)
+@conditional(feed_version)
+@cache.cached(timeout=FEED_CACHE_TTL, key_prefix=make_cache_key, response_filter=cacheable)
 def home_page():
     try:
-        data = dataRequests()  # Request post data
-        data_noticias = get_top_stories(num_noticias=get_exact_count())
-        # data_comment_user = get_infor_comment()
-
-        if (
-            not isinstance(data, dict)
-            or "todos_os_posts" not in data
-            or "post_banner" not in data
-        ):
+        snapshot = get_feed_snapshot()  # Um único fetch por requisição
+        viewer_id = current_user.get_id()
+
+        # Paginação por keyset: ?cursor=<id do último post visto>&limit=
+        cursor = request.args.get("cursor", type=int)
+        limit = request.args.get("limit", FEED_PAGE_SIZE, type=int)
+        limit = max(1, min(limit, FEED_MAX_PAGE_SIZE))
+
+        # Próximas páginas (infinite scroll): apenas os cards, em HTML ou JSON
+        if cursor is not None:
+            posts, next_cursor = load_feed_page(snapshot, cursor, limit, viewer_id)
+            if posts is None:
+                return redirect(url_for("errorHttp.page_erro"))
+
+            if wants_json():
+                response = jsonify(posts=posts, next_cursor=next_cursor)
+            else:
+                response = make_response(
+                    render_template(
+                        "partials/post_cards.html",
+                        posts=posts,
+                        id=current_user.id,
+                    )
+                )
+            response.headers["X-Next-Cursor"] = (
+                str(next_cursor) if next_cursor else ""
+            )
+            return response
+
+        # Primeira página: API de posts, API de notícias e banco em paralelo,
+        # cada fonte com seu próprio orçamento de tempo. Notícias lentas viram
+        # uma barra de notícias vazia em vez de travar a página.
+        fetched = gather(
+            feed=(
+                lambda: (
+                    load_feed_page(snapshot, cursor, limit, viewer_id),
+                    snapshot.banner(),  # Destaque do feed inteiro
+                ),
+                FANOUT_TIMEOUT_POSTS,
+                ((None, None), None),
+            ),
+            news=(news_service.articles, FANOUT_TIMEOUT_NEWS, []),
+            user_data=(
+                partial(get_user_info, current_user.id),
+                FANOUT_TIMEOUT_DB,
+                None,
+            ),
+            recommendations=(recommendationsUser, FANOUT_TIMEOUT_DB, []),
+        )
+
+        (posts, next_cursor), post_banner = fetched["feed"]
+        if posts is None or post_banner is None:
             return redirect(url_for("errorHttp.page_erro"))
 
-        posts = data["todos_os_posts"]  # Get the posts
-        post_banner = data["post_banner"]
+        # Uma notícia por post do feed
+        data_noticias = fetched["news"][: get_exact_count()]
 
         # Buscando informações do usuário logado
-        user_data = get_user_info(current_user.id)
+        user_data = fetched["user_data"]
         if not user_data:
-            clear_terminal()
-            logging.info("usuario não encotrado.")
-            return redirect(url_for("home.home_page"))
+            # Banco lento ou com falha: o feed sai sem os dados do perfil
+            # (foto, username) e essa versão parcial não entra no cache
+            logging.warning("dados do usuário indisponíveis, feed sem o perfil")
+            g.partial_page = True
+            user_data = {"username": current_user.username, "id": current_user.id}
 
         username = user_data.get("username")
         user_id = user_data.get("id")
         photo_user_profile = user_data.get("user_photo", None)
 
-        # 1. Chama a função `dataRequests()` para obter os dados da API ou
-        #  banco de dados,
-        # que geralmente retorna um dicionário contendo várias informações,
-        #  incluindo os posts.
-        var = dataRequests()
-        # 2. Extrai apenas os posts da resposta retornada, acessando a chave
-        #  "todos_os_posts".
-        # Isso garante que a variável `posts` contenha apenas a lista de posts
-        #  para ser processada.
-        posts = var["todos_os_posts"]  # Extrai apenas os posts
-        # 3. Envia a lista de posts para a função
-        # `enrich_posts_with_user_info()`,
-        # que adiciona informações adicionais aos comentários, como nome e foto
-        #  do autor.
-        # O resultado enriquecido é armazenado em `enriched_posts`.
-        enriched_posts = enrich_posts_with_user_info(posts)
-
-
-       
-
+        # Os posts já chegam enriquecidos por `load_feed_page()`.
+        enriched_posts = posts
 
-        recommendations = recommendationsUser()  # Prepare recomendações
+        recommendations = fetched["recommendations"]  # Prepare recomendações
         likes = [
             post["likes"] for post in posts if post["likes"] >= 0
         ]  # Filtros ou lógica adicional para os posts
 
+        # Todos os redirects possíveis já foram tratados: envia em stream
         if current_user.is_authenticated:
-            return render_template(
+            return render_page(
                 "home.html",
                 username=username,
                 usuario=current_user.username,
@@ -101,14 +243,18 @@ def home_page():
                 likes=likes,
                 data_noticias=data_noticias,
                 foto_commet=enriched_posts,
+                next_cursor=next_cursor,
+                limit=limit,
             )
         else:
-            return render_template(
+            return render_page(
                 "home.html",
                 id=user_id,
                 posts=posts,
                 post_banner=post_banner,
                 likes=likes,
+                next_cursor=next_cursor,
+                limit=limit,
             )
 
     except Exception as e:  # capturing error and saving to a log file
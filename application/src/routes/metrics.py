@@ -0,0 +1,28 @@
+from flask import Blueprint, jsonify
+from flask_login import login_required
+
+from application.src.database.conexao import checkpointer, pool_metrics
+from application.src.services.fragment_cache import fragment_cache
+from application.src.services.http_clients import http_clients
+from application.src.services.invalidation import bus
+from application.src.services.perfil_cache import profile_cache
+from application.src.services.post_mirror import post_mirror
+from application.src.services.upstream_cache import posts_cache
+
+metrics_ = Blueprint("metrics", __name__)
+
+
+# Métricas internas de desempenho (cache da API de posts, latência por host, etc.)
+@metrics_.route("/devorbit/metrics/")
+@login_required
+def metrics():
+    return jsonify(
+        posts_api=posts_cache.metrics(),
+        http_clients=http_clients.metrics(),
+        post_mirror=post_mirror.metrics(),
+        post_cards=fragment_cache.metrics(),
+        profiles=profile_cache.metrics(),
+        invalidation_events=bus.metrics(),
+        sqlite_pools=pool_metrics(),
+        sqlite_wal=checkpointer.metrics(),
+    )
@@ -1,24 +1,52 @@
-from flask import Blueprint, render_template, send_from_directory, request, redirect, url_for
-from flask_login import current_user, login_required
-from application.src.__main__ import cache
-from application.src.services.api_service import dataRequests
-from application.src.services.user_service import get_user_info, UserData, enrich_posts_with_user_info
-
-
 import logging
-import sqlite3
-import os
+
 from dotenv import load_dotenv
+from flask import Blueprint, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+
+from application.src.__main__ import cache
+from application.src.database.users.follow_graph import follow_graph
+from application.src.services.cache_generations import (
+    PROFILE_PAGE_CACHE_TTL,
+    feed_generation,
+    profile_generation,
+)
+from application.src.services.conditional import conditional
+from application.src.services.feed_snapshot import get_feed_snapshot
+from application.src.services.static_assets import send_media
+from application.src.services.user_service import UserData, get_user_info
 
 load_dotenv()
 
 profile = Blueprint('perfil', __name__, template_folder='templates')
 viws_img = Blueprint('img', __name__, template_folder='templates') # Não esta Sendo usada
 
+def profile_version():
+    """
+    O que identifica uma versão da página de perfil: quem vê, o perfil
+    visitado e as gerações do feed (posts) e dos dois perfis envolvidos.
+    """
+    usuario = request.view_args.get('usuario')
+    get_feed_snapshot().revalidate()  # Sem esperar a API (ver feed_version)
+    return (
+        "perfil",
+        current_user.id,
+        usuario,
+        feed_generation(),
+        profile_generation(usuario),
+        profile_generation(current_user.id),
+    )
+
+
 # Função para gerar uma chave de cache específica para cada usuário
+def make_cache_key():
+    return ":".join(str(part) for part in profile_version())
+
 
 @profile.route('/devorbit/perfil/<usuario>/') # usuario é o ID que passamos em home.html como link para o perfil
 @login_required
+@conditional(profile_version)
+@cache.cached(timeout=PROFILE_PAGE_CACHE_TTL, key_prefix=make_cache_key)
 def profile_page(usuario):
     
     
@@ -64,12 +92,15 @@ def profile_page(usuario):
 
            
     
-        # Verificar se é o perfil do próprio usuário logado | caso não for mostre o btn de seguir
-        seguir = 'Networking' if usuario != current_user.username else None
-
-        # Filtrar os posts do usuário
-        data = dataRequests()
-        if not isinstance(data, dict) or 'todos_os_posts' not in data:
+        # Estado inicial do botão de seguir (o clique usa /devorbit/follow/<id>/);
+        # o template esconde o botão no perfil do próprio usuário logado
+        is_following = usuario_id in follow_graph.follows_many(current_user.id, [usuario_id])
+
+        # Posts do usuário direto do espelho local (índice por user_id),
+        # sem formatar o feed inteiro só para filtrar depois
+        # (autores e comentários na mesma consulta: feed_dao)
+        user_posts = get_feed_snapshot().user_posts(current_user.id)
+        if user_posts is None:
             return redirect(url_for('errorHttp.page_erro'))
         
         
@@ -77,18 +108,10 @@ def profile_page(usuario):
         
         
         # Vamos pergar os posts do usuario desta variavel | AQUI MOSTRA APENAS OS POSTS DO USUARIO | PERFIL
-        filtered_user_posts = [post for post in data['todos_os_posts'] if post['user_id'] == current_user.id]
+        filtered_user_posts = [post for post in user_posts if post['user_id'] == current_user.id]
        
-        # 1. Chama a função `dataRequests()` para obter os dados da API ou banco de dados,
-        # que geralmente retorna um dicionário contendo várias informações, incluindo os posts.
-        var = dataRequests()
-        # 2. Extrai apenas os posts da resposta retornada, acessando a chave "todos_os_posts".
-        # Isso garante que a variável `posts` contenha apenas a lista de posts para ser processada.
-        posts = var["todos_os_posts"]  # Extrai apenas os posts
-        # 3. Envia a lista de posts para a função `enrich_posts_with_user_info()`,
-        # que adiciona informações adicionais aos comentários, como nome e foto do autor.
-        # O resultado enriquecido é armazenado em `enriched_posts`.
-        enriched_posts = enrich_posts_with_user_info(posts)
+        # Os comentários já vêm com nome e foto do autor (`hydrate_posts`)
+        enriched_posts = filtered_user_posts
 
 
         print(user_metadata, '<<< user_metadata')
@@ -100,6 +123,8 @@ def profile_page(usuario):
             username=name,
             usuario=current_user.username,
             id=current_user.id,
+            profile_id=usuario_id,
+            is_following=is_following,
             posts = filtered_user_posts,
             photo_user_profile =photo_user_profile,
             banner=banner,
@@ -124,5 +149,5 @@ def profile_page(usuario):
 # None / off
 @viws_img.route('/files/<path:filename>')
 def serve_files(filename):
-    return send_from_directory('application/src/static/fotos', filename)
+    return send_media('application/src/static/fotos', filename)
 
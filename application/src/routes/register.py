@@ -1,4 +1,5 @@
 import logging
+
 from email_validator import EmailNotValidError, validate_email
 from flask import (
     Blueprint,
@@ -14,7 +15,6 @@ from flask_login import login_user
 from application.src.database.users.configure_users import (
     User,
     add_user,
-    my_db,
 )
 from application.src.models.modelsUser import Cadastro
 
@@ -70,16 +70,12 @@ def page_register():
                 password=password,
             )
 
-            # Adiciona o usuário ao banco de dados
-            add_user(
-                register_in_db
-            )  # Aqui, chamamos a função add_user para add user
-
-            # Recupera o ID do usuário após o registro
-            banco, cursor = my_db()
-            cursor.execute("SELECT id FROM usuarios WHERE email = ?", (email,))
-            user_id = cursor.fetchone()[0]
-            banco.close()
+            # Adiciona o usuário ao banco de dados (uma transação, que já
+            # devolve o ID gerado)
+            user_id = add_user(register_in_db)
+            if user_id is None:
+                flash("Não foi possível criar a conta. Este e-mail já está cadastrado?", "error")
+                return redirect(url_for("register.page_register"))
 
             if register_in_db and add_user and Cadastro:
                 # Adiciona informações à sessão
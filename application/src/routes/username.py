@@ -43,9 +43,10 @@ def register_username():
             occupation=profession,
         )
 
-        if account_information:
-            # Salva as informações no banco de dados
-            add_user_information(account_information)
+        # Salva as informações no banco de dados
+        if add_user_information(account_information) is None:
+            flash("Não foi possível salvar. Este nome de usuário já está em uso?", "error")
+            return redirect(url_for("username_page.register_username"))
 
         current_user.username = username
         current_user.email = user_email
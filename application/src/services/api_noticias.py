@@ -1,74 +1,72 @@
-from application.src.services.api_service import dataRequests, fetch_api_data
-
-import requests
+import hashlib
 import logging
+import os
+import threading
+import time
+
 import httpx
 from dotenv import load_dotenv
-import os
+
+from application.src.services.feed_snapshot import get_feed_snapshot
+from application.src.services.http_clients import http_clients
+
 load_dotenv()
 
+# Timeout (s) da requisição à API de notícias
+NEWS_TIMEOUT = float(os.getenv("NEWS_TIMEOUT", 5))
+# Intervalo (s) entre as atualizações das notícias em segundo plano
+NEWS_REFRESH_INTERVAL = float(os.getenv("NEWS_REFRESH_INTERVAL", 900))
+
 
 
 def get_exact_count():
     """"
-     Percorre a lista de posts retornada pela função `fetch_api_data()` e calcula a quantidade total de posts.
+    Calcula a quantidade total de posts do feed.
 
-    Para cada post encontrado, incrementa o contador, que será utilizado para associar notícias 
-    ou conteúdos específicos na página inicial.
+    Usa o snapshot da requisição (`get_feed_snapshot()`), então a contagem não
+    baixa a lista de posts de novo quando a rota já buscou o feed.
 
     Returns:
-        int: O número total de posts encontrados na lista retornada por `fetch_api_data()`.
+        int: O número total de posts encontrados no snapshot do feed.
     """
-    
-    post_count =0
-    var = fetch_api_data() 
+    return get_feed_snapshot().count()
 
-    if var is None:
-        return 0
-    
-    
-    
-    for key in var: 
-        
-            post_count += 1  # Incrementar o contador se necessário
-            continue
 
-    return post_count
-
-   
-
-
-
-def get_top_stories(num_noticias=get_exact_count()):  # Define dinamicamente a quantidade de notícia
+def fetch_top_stories() -> list:
+    """Busca e formata todas as notícias da API (sem limitar a quantidade)."""
 
     api_url = os.getenv("API_NOTICIA") #  API 
     
     if not api_url:
-        print("⚠️ Por favor, configure a chave da API de notícias! Acesse https://developer.nytimes.com/ para obter sua chave.")
+        logging.warning("⚠️ Por favor, configure a chave da API de notícias! Acesse https://developer.nytimes.com/ para obter sua chave.")
         return []
 
-    response = requests.get(api_url)
+    response = http_clients.get(api_url, timeout=NEWS_TIMEOUT)
 
     if response.status_code == 200:
         news_data = response.json()
         
         # Pega os resultados da API
         if "results" in news_data:
-            articles = news_data["results"][:num_noticias]  # Limita o número de notícias conforme num_noticias
             content = []
             
-            for article in articles:
-                title = article["title"]
-                url = article["url"]
+            for article in news_data["results"] or []:
+                if not isinstance(article, dict):
+                    continue
+                title = article.get("title")
+                url = article.get("url")
+                if not title or not url:
+                    # Notícia incompleta: pula em vez de derrubar a atualização
+                    logging.warning("news article without title/url skipped")
+                    continue
                 summary = article.get("abstract", "Sem resumo disponível.")
 
                 # Tenta pegar a imagem
                 image_url = None
-                if "multimedia" in article and article["multimedia"] is not None:
-                    for multimedia in article["multimedia"]:
-                        if multimedia.get("format") == 'Super Jumbo':  # Usando .get() para evitar KeyError
-                            image_url = multimedia["url"]
-                            break
+                for multimedia in article.get("multimedia") or []:
+                    if isinstance(multimedia, dict) and multimedia.get("format") == 'Super Jumbo':  # Usando .get() para evitar KeyError
+                        image_url = multimedia.get("url")
+                        break
                 
                 content.append({
                     "titulo": title,
@@ -86,5 +84,84 @@ def get_top_stories(num_noticias=get_exact_count()):  # Define dinamicamente a q
         logging.error(f"Error: in api of noctic status code. {response.status_code}")
         return []
 
-    
-    
+
+class NewsService:
+    """
+    Serviço de notícias em memória.
+
+    Uma thread por processo atualiza as top stories do NYT a cada
+    `NEWS_REFRESH_INTERVAL` segundos e guarda a lista já formatada; as páginas
+    apenas leem fatias dessa lista. A thread só é iniciada no primeiro uso,
+    então importar este módulo não faz nenhuma requisição.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._articles = []
+        self._version = ""  # Hash das URLs das notícias atuais
+        self._lock = threading.Lock()
+        self._pid = None  # Processo em que a thread de atualização roda
+        self._loaded = threading.Event()
+
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name="news-refresh", daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                # A thread não pode morrer: `start()` não a reinicia neste processo
+                logging.exception("news-refresh: falha inesperada na atualização")
+            time.sleep(self.interval)
+
+    def refresh(self):
+        try:
+            try:
+                articles = fetch_top_stories()
+            except (httpx.HTTPError, ValueError) as erro:
+                logging.error(f"Error: in api of noctic: {erro.__class__.__name__}")
+                articles = []
+
+            # Mantém a última lista boa se a API falhar
+            if articles:
+                version = hashlib.md5(
+                    "|".join(article["url"] for article in articles).encode()
+                ).hexdigest()[:12]
+                with self._lock:
+                    self._articles = articles
+                    self._version = version
+        finally:
+            # Mesmo com erro quem espera em `articles()` é liberado
+            self._loaded.set()
+
+    @property
+    def version(self) -> str:
+        """
+        Versão da lista de notícias (vazia antes da primeira carga). Derivada
+        do conteúdo, então é a mesma em todos os workers com as mesmas
+        notícias; entra na chave de cache e no ETag do feed.
+        """
+        return self._version
+
+    def articles(self) -> list:
+        """Todas as notícias em cache (espera a primeira carga por até NEWS_TIMEOUT)."""
+        self.start()
+        self._loaded.wait(timeout=NEWS_TIMEOUT)
+        return self._articles
+
+    def top(self, num_noticias: int) -> list:
+        return self.articles()[:num_noticias]
+
+
+news_service = NewsService(NEWS_REFRESH_INTERVAL)
+
+
+def get_top_stories(num_noticias=None):  # Define dinamicamente a quantidade de notícia
+    if num_noticias is None:
+        num_noticias = get_exact_count()  # Uma notícia por post do feed
+    return news_service.top(num_noticias)  # Limita o número de notícias conforme num_noticias
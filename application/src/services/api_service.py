@@ -1,116 +1,54 @@
 'UTF-8'
+import logging
+import os
+import sqlite3
 from typing import Dict
-from datetime import datetime
-from dotenv import load_dotenv
-from flask_login import current_user
-from application.src.database.users.configure_users import my_db
-from application.src.utils.terminal import clear_terminal
-from application.src.__main__ import cache
-
-
-import logging 
 
 import httpx
-import sqlite3
-import os
+from dotenv import load_dotenv
+
+from application.src.services.author_directory import AuthorDirectory
+from application.src.services.upstream_cache import posts_cache
+from application.src.utils.terminal import clear_terminal
 
 logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
 load_dotenv()
 
-def make_cache_key():
+def fetch_api_data() -> list:
     """
-    Gera uma chave única de cache para cada usuário logado.
-    Combina o ID do usuário e o caminho da requisição.
+    Retorna os posts da API formatados como lista.
+    A leitura passa pelo `posts_cache` (stale-while-revalidate), então a API só
+    é chamada quando o TTL vence, e com requisição condicional (ETag / 304).
     """
-    return f"{current_user.id}" 
-
-
-@cache.cached(timeout=5000, key_prefix=make_cache_key)
-def get_user_info(user_id): 
-    '''
-    Esta função serve para busca dados padrão caso algum tipo de dado do usuario não esteja em 
-    (user_information) Podemos resgata os dados aqui
-    '''
-    banco, cursor = my_db()
-
-    # Buscar informações completas do usuário no banco
-    cursor.execute(
-        'SELECT id, photo, bio, github, likedin, site, followers, following, banner, name FROM usuarios WHERE name = ?',
-        (user_id,)
-    )
-    user = cursor.fetchone()
-   
-
-    if not user:
-        
-        return None
-
-    return [{
-        'id': user[0],
-        'user_photo': user[1],
-        'bio': user[2],
-        'github': user[3],
-        'linkedin': user[4],
-        'site': user[5],
-        'followers': user[6],
-        'following': user[7],
-        'banner': user[8],
-        'username': user[9]
-    }]
-
+    posts = posts_cache.get(os.getenv('API'))
 
-def fetch_api_data() -> list:
-    """Faz requisição à API e retorna os dados formatados como lista."""
-    try:
-        response = httpx.get(os.getenv('API'), timeout=10)
-        print(response)
-        print(f"Resposta da API: {response.status_code}")  # Para debugging, remova antes de produção
-
-        if response.status_code != 200 or not response.is_success: # bool
-            print(f"Erro na API: {response.status_code}")
-            return []
-        
-       
-        try:
-            posts = response.json()
-            if not isinstance(posts, list):
-               
-
-                return list(posts)
-            return posts
-        except ValueError:
-            print("Erro ao converter a resposta para JSON")
-            return []
-    except httpx.HTTPStatusError as e:
-        #log_error(e)
+    if posts is None:
         return []
-    except Exception as e:
-        print(e.__class__.__name__)
+    if not isinstance(posts, list):
+        return list(posts)
+    return posts
 
 
-def fetch_database_data() -> Dict:
-    """Busca informações complementares do banco de dados SQLite."""
+def fetch_database_data(posts: list) -> Dict:
+    """
+    Busca informações complementares do banco de dados SQLite.
+    Resolve apenas os autores presentes em `posts` (AuthorDirectory), com uma única consulta.
+    """
     try:
-        conn = sqlite3.connect(os.getenv("BANCO_DB"))
-        cursor = conn.cursor()
+        authors = AuthorDirectory.from_posts(posts).resolve()
 
         # Buscar fotos dos usuários
-        cursor.execute("SELECT name, photo FROM usuarios")
-        user_photos = dict(cursor.fetchall())
-        
+        user_photos = {name: author['photo'] for name, author in authors.items()}
 
-        # Buscar nomes de usuário e ocupações
-        cursor.execute("SELECT name, username, occupation FROM user_information")
-        user_usernames = {name: {'username': username, 'occupation': occupation} 
-                          for name, username, occupation in cursor.fetchall()}
+        # Buscar nomes de usuário e ocupações (apenas quem já criou o username)
+        user_usernames = {name: {'username': author['username'], 'occupation': author['occupation']}
+                          for name, author in authors.items() if author['username']}
         logging.debug("fetching user data")
         
         return {"user_photos": user_photos, "user_usernames": user_usernames}
     except sqlite3.Error as e:
         logging.critical(f"Erro no banco de dados: {e.__class__.__name__}: line 63")
         return {"user_photos": {}, "user_usernames": {}}
-    finally:
-        conn.close()
 
 
 def format_posts(posts: list, db_data: Dict) -> Dict:
@@ -126,12 +64,9 @@ def format_posts(posts: list, db_data: Dict) -> Dict:
            
             real_name = post.get('nome', 'Desconhecido')
             
-            # Esta variavel pegar o nome do usuario caso não seja encontrado o
-            # username || nome de usuario em (user_info)
-            Users_default_name = post.get('nome', 'Desconhecido')
-            variavel = get_user_info(Users_default_name)  # Nome padrão do usuario 
-
-            user_info = user_usernames.get(real_name, {"username": variavel[0]['username'], "occupation": "Desconhecido"})
+            # Caso não seja encontrado o username || nome de usuario em (user_info)
+            # usamos o nome padrão do usuario (o mesmo de `usuarios.name`)
+            user_info = user_usernames.get(real_name, {"username": real_name, "occupation": "Desconhecido"})
             comments = post.get('comments', [{'comment': 'Ainda não há comentários'}])
 
             if "username" not in user_info:
@@ -199,32 +134,39 @@ def format_posts(posts: list, db_data: Dict) -> Dict:
         logging.critical(erro)
         
 
-    featured_posts = [post for post in best_post_list if post['likes'] >= 1]
-    banner = {
+    # O destaque do feed vem do espelho (`post_mirror.featured()`); aqui só o
+    # primeiro post curtido da lista recebida, sem montar uma lista nova
+    banner = next((post for post in best_post_list if post['likes'] >= 1), None) or default_banner()
+
+    return {"todos_os_posts": best_post_list, "post_banner": banner}
+
+
+def default_banner() -> Dict:
+    """Banner exibido enquanto nenhum post atende à regra de destaque."""
+    return {
         'post_titulo': os.getenv('MENSAGEN', "Fala Dev!"),
         'post': os.getenv('MENSAGEN_POST', "Os melhores posts vão aparecer aqui! 🌟 Não deixe de comentar e compartilhar suas ideias. Vamos juntos criar uma comunidade incrível!"),
         'nome': os.getenv('CODECHAMBER', "DEV ORBIT")
     }
 
-    if featured_posts:
-        banner = featured_posts[0]
-
-    return {"todos_os_posts": best_post_list, "post_banner": banner}
-
 
-def dataRequests() -> Dict:
-    """Processa dados da API e do banco de dados, retornando um dicionário formatado."""
-    try:
+def dataRequests(posts: list = None) -> Dict:
+    """
+    Processa dados da API e do banco de dados, retornando um dicionário formatado.
+    Se `posts` já foi buscado (ex: pelo FeedSnapshot), a API não é chamada de novo.
+    """
+    if posts is None:
         posts = fetch_api_data()
-        db_data = fetch_database_data()
-        logging.info(f"all data has been loaded")
+    try:
+        db_data = fetch_database_data(posts)
+        logging.info("all data has been loaded")
         return format_posts(posts, db_data)
     
     except Exception as e:
         logging.error(f"Error processing API data: {e.__class__.__name__}: line 125")
         logging.critical(f"processing error: {e.__class__.__name__}: line 126")
         #log_error(e)
-        return fetch_api_data()
+        return posts
         
     except httpx.exceptions.ConnectionError as e:
         clear_terminal()
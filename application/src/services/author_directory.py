@@ -0,0 +1,55 @@
+import logging
+
+from application.src.database.conexao import in_chunks, users_db
+
+
+class AuthorDirectory:
+    """
+    Diretório de autores de uma página do feed.
+
+    Junta os nomes distintos dos autores dos posts e resolve todos com um
+    único `IN (...)` sobre `user_card` (projeção de `usuarios` +
+    `user_information` mantida pelas escritas, sem join). Guarda apenas os
+    autores da página, então a memória acompanha o tamanho da página e não
+    o total de usuários cadastrados.
+    """
+
+    def __init__(self, names):
+        self.names = sorted({name for name in names if name})
+        self.authors = {}
+
+    @classmethod
+    def from_posts(cls, posts: list):
+        return cls(post.get("nome") for post in posts or [] if isinstance(post, dict))
+
+    def resolve(self) -> dict:
+        """Busca foto, username e ocupação de cada autor. Retorna {nome: dados}."""
+        if not self.names:
+            return self.authors
+
+        with users_db(readonly=True) as conn:
+            cursor = conn.cursor()
+            for chunk, placeholders in in_chunks(self.names):
+                cursor.execute(
+                    f"""
+                    SELECT name, photo, username, occupation
+                    FROM user_card
+                    WHERE name IN ({placeholders})
+                    """,
+                    chunk,
+                )
+                for name, photo, username, occupation in cursor.fetchall():
+                    # Nomes repetidos: vale o primeiro usuário encontrado
+                    self.authors.setdefault(
+                        name,
+                        {
+                            "photo": photo,
+                            "username": username,
+                            "occupation": occupation,
+                        },
+                    )
+
+        logging.debug(
+            f"author directory: {len(self.authors)}/{len(self.names)} autores resolvidos"
+        )
+        return self.authors
@@ -0,0 +1,136 @@
+import logging
+import os
+import time
+from functools import wraps
+
+from flask import has_app_context
+
+from application.src.__main__ import cache
+from application.src.services.invalidation import (
+    AVATAR_CHANGED,
+    BANNER_CHANGED,
+    POST_CREATED,
+    POSTS_SYNCED,
+    PROFILE_UPDATED,
+    WEB_CONCURRENCY,
+    bus,
+)
+from application.src.services.perfil_cache import profile_cache
+from application.src.services.upstream_cache import posts_cache
+
+# Backends do flask-caching que vivem na memória de cada processo
+LOCAL_CACHE_TYPES = {"SimpleCache", "simple", "NullCache", "null"}
+# As gerações só são vistas por todos os workers se o backend for
+# compartilhado (RedisCache, FileSystemCache, ...) ou se houver um processo só
+GENERATIONS_SHARED = (
+    os.getenv("CACHE", "SimpleCache") not in LOCAL_CACHE_TYPES or WEB_CONCURRENCY <= 1
+)
+
+# Com as gerações nas chaves, os TTLs das páginas podem ser longos:
+# qualquer escrita troca a chave em vez de esperar o cache vencer. Sem
+# gerações compartilhadas, o TTL é o tempo em que um worker pode servir
+# uma página velha, então o padrão é curto.
+DEFAULT_PAGE_CACHE_TTL = 3600 if GENERATIONS_SHARED else 30
+FEED_CACHE_TTL = int(os.getenv("FEED_CACHE_TTL", DEFAULT_PAGE_CACHE_TTL))
+PROFILE_PAGE_CACHE_TTL = int(
+    os.getenv("PROFILE_PAGE_CACHE_TTL", DEFAULT_PAGE_CACHE_TTL)
+)
+
+
+def _key(scope: str) -> str:
+    return f"gen:{scope}"
+
+
+def generation(scope: str) -> int:
+    """
+    Geração atual de `scope` (ex: "feed", "perfil:3"), guardada no mesmo
+    backend do flask-caching das páginas. As gerações são timestamps em ns:
+    se a entrada for descartada pelo backend, a nova geração nunca coincide
+    com uma antiga, então o pior caso é um miss, nunca uma página velha.
+
+    Com um backend local (SimpleCache, o padrão do .env) cada processo tem
+    suas gerações: um `bump` em um worker não chega aos outros. Isso só é
+    seguro com um processo (WEB_CONCURRENCY=1); com mais, use um backend
+    compartilhado ou conte com os TTLs curtos (GENERATIONS_SHARED).
+    """
+    value = cache.get(_key(scope))
+    if value is None:
+        cache.add(_key(scope), time.time_ns(), timeout=0)
+        value = cache.get(_key(scope)) or 0
+    return value
+
+
+def bump(scope: str):
+    cache.set(_key(scope), time.time_ns(), timeout=0)
+
+
+def feed_generation() -> int:
+    return generation("feed")
+
+
+def profile_generation(user_id) -> int:
+    return generation(f"perfil:{user_id}")
+
+
+# Inscritos do barramento --------------------------------------------------
+
+
+def on_post_created(**payload):
+    # O post vai para a API externa: a próxima leitura busca a API na hora
+    # (requisição condicional) em vez de servir o payload em cache
+    posts_cache.invalidate()
+    bump("feed")
+
+
+def on_posts_synced(**payload):
+    bump("feed")
+
+
+def on_profile_updated(user_id=None, name=None, **payload):
+    profile_cache.invalidate(user_id=user_id, name=name)
+    if user_id is not None:
+        bump(f"perfil:{user_id}")
+    if name is not None:
+        # Username novo aparece nos cards do feed
+        bump("feed")
+
+
+def on_avatar_changed(user_id=None, **payload):
+    profile_cache.invalidate(user_id=user_id)
+    bump(f"perfil:{user_id}")
+    bump("feed")  # A foto aparece nos cards e comentários do feed
+
+
+def on_banner_changed(user_id=None, **payload):
+    profile_cache.invalidate(user_id=user_id)
+    bump(f"perfil:{user_id}")
+
+
+def register_invalidation_handlers(app):
+    """
+    Inscreve os handlers no barramento. Eventos podem ser publicados fora de
+    uma requisição (ex: sincronização do espelho no fan-out), então cada
+    handler roda dentro do contexto da aplicação para acessar o `cache`.
+    """
+    if not GENERATIONS_SHARED:
+        logging.warning(
+            f"cache {app.config.get('CACHE_TYPE')} é por processo e WEB_CONCURRENCY={WEB_CONCURRENCY}: "
+            f"invalidações não chegam aos outros workers, páginas em cache por até {FEED_CACHE_TTL}s. "
+            "Use um backend compartilhado (ex: RedisCache) para gerações entre workers."
+        )
+
+    def in_app_context(handler):
+        @wraps(handler)
+        def wrapper(**payload):
+            if has_app_context():
+                return handler(**payload)
+            with app.app_context():
+                return handler(**payload)
+
+        return wrapper
+
+    bus.subscribe(POST_CREATED, in_app_context(on_post_created))
+    bus.subscribe(POSTS_SYNCED, in_app_context(on_posts_synced))
+    bus.subscribe(PROFILE_UPDATED, in_app_context(on_profile_updated))
+    bus.subscribe(AVATAR_CHANGED, in_app_context(on_avatar_changed))
+    bus.subscribe(BANNER_CHANGED, in_app_context(on_banner_changed))
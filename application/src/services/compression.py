@@ -0,0 +1,127 @@
+import os
+import zlib
+
+from flask import request
+
+try:  # Brotli é opcional: precisa do pacote `brotli` (pip install brotli)
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+COMPRESS_ENABLED = os.getenv("COMPRESS", "1") == "1"
+# Respostas menores que isso (bytes) não compensam a compressão
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 500))
+# Níveis para respostas dinâmicas (rápidos); os arquivos estáticos usam o
+# nível máximo no build (utils/precompress.py)
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", 6))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 5))
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+}
+
+# Extensão do arquivo pré-comprimido de cada encoding
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def supported_encodings() -> list:
+    """Encodings em ordem de preferência (brotli primeiro, se instalado)."""
+    return ["br", "gzip"] if BROTLI_AVAILABLE else ["gzip"]
+
+
+def negotiate_encoding():
+    """Melhor encoding aceito pelo cliente (Accept-Encoding), ou None."""
+    return request.accept_encodings.best_match(supported_encodings())
+
+
+def compress(data: bytes, encoding: str, level: int = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(
+            data, quality=COMPRESS_BROTLI_QUALITY if level is None else level
+        )
+    return _gzip(data, COMPRESS_LEVEL if level is None else level)
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    compressor = _gzip_compressor(level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _gzip_compressor(level: int):
+    # wbits 31 = formato gzip (cabeçalho + CRC)
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def _compress_stream(chunks, encoding: str):
+    """
+    Comprime uma resposta em stream parte por parte, dando flush a cada
+    bloco para o navegador receber o <head> sem esperar o resto da página.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = _gzip_compressor(COMPRESS_LEVEL)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def _should_compress(response) -> bool:
+    return (
+        200 <= response.status_code < 300
+        and response.status_code not in (204, 206)
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+        and "Content-Encoding" not in response.headers
+        # send_file / estáticos: servidos direto do disco, já comprimidos no
+        # build (ver static_assets.serve_static)
+        and not response.direct_passthrough
+    )
+
+
+def compress_response(response):
+    """after_request: gzip/brotli para HTML e JSON gerados pela aplicação."""
+    response.vary.add("Accept-Encoding")
+    if not _should_compress(response):
+        return response
+
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(compress(data, encoding))
+
+    response.headers["Content-Encoding"] = encoding
+    # O corpo mudou: a validação passa a ser fraca (mesmo conteúdo, bytes diferentes)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def register_compression(app):
+    if not COMPRESS_ENABLED:
+        return
+
+    app.after_request(compress_response)
@@ -0,0 +1,71 @@
+import hashlib
+import os
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+# Pastas cujo conteúdo muda o HTML gerado (templates e CSS/JS referenciados)
+RELEASE_DIRS = ("templates", "static/css", "static/js")
+
+_release = None
+
+
+def release_version() -> str:
+    """
+    Assinatura do deploy: tamanho e mtime dos templates e do CSS/JS.
+    Igual em todos os workers do mesmo deploy; muda quando um template muda,
+    então um ETag antigo nunca devolve 304 para um HTML de outro deploy.
+    """
+    global _release
+    if _release is None:
+        sha = hashlib.md5()
+        for folder in RELEASE_DIRS:
+            for root, _, files in sorted(
+                os.walk(os.path.join(current_app.root_path, folder))
+            ):
+                for name in sorted(files):
+                    stat = os.stat(os.path.join(root, name))
+                    sha.update(
+                        f"{root}/{name}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+                    )
+        _release = sha.hexdigest()[:12]
+    return _release
+
+
+def make_etag(*parts) -> str:
+    return hashlib.md5(
+        "|".join(str(part) for part in (release_version(), *parts)).encode()
+    ).hexdigest()
+
+
+def conditional(etag_parts):
+    """
+    Decorator de GET condicional com ETag fraco calculado ANTES da view.
+
+    `etag_parts()` devolve o que identifica a versão da resposta (gerações
+    do cache, quem vê, caminho...). Se o If-None-Match bater, a resposta é
+    um 304 vazio: nem `format_posts` nem o Jinja chegam a rodar. Caso
+    contrário a view roda normalmente e o ETag vai na resposta 200.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = make_etag(*etag_parts())
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response  # Redirects/erros não recebem ETag
+
+            response.set_etag(etag, weak=True)
+            # Página por usuário: o navegador guarda, mas sempre revalida
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
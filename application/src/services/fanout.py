@@ -0,0 +1,54 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+# Orçamento de tempo (s) de cada fonte do feed
+FANOUT_TIMEOUT_POSTS = float(os.getenv("FANOUT_TIMEOUT_POSTS", 10))
+FANOUT_TIMEOUT_NEWS = float(os.getenv("FANOUT_TIMEOUT_NEWS", 2))
+FANOUT_TIMEOUT_DB = float(os.getenv("FANOUT_TIMEOUT_DB", 2))
+
+
+def gather(**sources) -> dict:
+    """
+    Executa as fontes em paralelo e devolve {nome: resultado}.
+
+    Cada fonte é uma tupla (função, timeout, padrão). Cada requisição tem seu
+    executor, com uma thread por fonte: todas começam juntas, então o timeout
+    conta a partir do início da própria fonte, sem fila. Se a fonte estourar
+    o tempo ou falhar, o valor padrão é usado e a página segue sem ela (ex:
+    notícias vazias); a thread dela termina sozinha, sem segurar workers de
+    outras requisições.
+    As funções rodam fora do contexto da requisição: passe os valores de
+    `current_user` / `g` já resolvidos.
+    """
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, len(sources)), thread_name_prefix="fanout"
+    )
+    try:
+        futures = {
+            name: (executor.submit(function), timeout, default)
+            for name, (function, timeout, default) in sources.items()
+        }
+
+        results = {}
+        for name, (future, timeout, default) in futures.items():
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FuturesTimeout:
+                logging.warning(
+                    f"fan-out: '{name}' excedeu {timeout}s, usando valor padrão"
+                )
+                results[name] = default
+            except Exception as erro:
+                logging.error(f"fan-out: '{name}' falhou: {erro.__class__.__name__}")
+                results[name] = default
+    finally:
+        # Não espera as fontes que estouraram o tempo
+        executor.shutdown(wait=False)
+
+    logging.debug(f"fan-out concluído em {time.monotonic() - started:.3f}s")
+    return results
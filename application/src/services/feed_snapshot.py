@@ -0,0 +1,149 @@
+import logging
+import os
+import threading
+
+from flask import g, has_app_context
+
+from application.src.database.feed_dao import feed_dao
+from application.src.services.api_service import dataRequests, default_banner
+from application.src.services.post_mirror import post_mirror
+from application.src.services.upstream_cache import posts_cache
+from application.src.services.user_service import hydrate_posts
+
+# Paginação do feed (?cursor=&limit=)
+FEED_PAGE_SIZE = int(os.getenv("FEED_PAGE_SIZE", 20))
+FEED_MAX_PAGE_SIZE = int(os.getenv("FEED_MAX_PAGE_SIZE", 50))
+
+
+def sync_mirror(posts):
+    """Leva um payload da API para o espelho local (sem propagar falhas)."""
+    try:
+        post_mirror.sync(posts if isinstance(posts, list) else list(posts))
+    except Exception as erro:
+        logging.error(
+            f"Falha ao sincronizar o espelho de posts: {erro.__class__.__name__}"
+        )
+
+
+# Atualizações em segundo plano do posts_cache também chegam ao espelho
+posts_cache.subscribe(sync_mirror)
+
+
+class FeedSnapshot:
+    """
+    Fotografia do feed montada uma única vez por requisição.
+
+    Na primeira leitura o espelho local (`post_mirror`) é sincronizado com a
+    API; depois disso rotas, busca e contagem de notícias consultam apenas o
+    SQLite. Os contadores mostram quantas requisições à API a requisição
+    realmente esperou e quantas leituras do espelho fez; atualizações em
+    segundo plano (`revalidate`) aparecem só no /metrics do posts_cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Partes da página rodam no fan-out
+        self._synced = False
+        self._count = None
+        self.upstream_calls = 0  # Requisições à API de posts esperadas
+        self.db_reads = 0  # Consultas ao espelho local
+
+    def sync(self):
+        """Sincroniza o espelho com a API, uma vez por requisição."""
+        with self._lock:
+            if self._synced:
+                return
+            self._synced = True
+
+            posts = posts_cache.get(os.getenv("API"), on_request=self._count_upstream)
+            if posts is None:
+                # API fora do ar e sem cache: o espelho continua com o último estado
+                logging.warning("API de posts indisponível, servindo o espelho local")
+                return
+            sync_mirror(posts)
+
+    def revalidate(self):
+        """
+        Sem bloquear a requisição: se o payload da API venceu, atualiza em
+        segundo plano; posts novos chegam ao espelho pelo `sync_mirror` e
+        trocam a geração do feed (POSTS_SYNCED) para as próximas requisições.
+        """
+        posts_cache.revalidate(os.getenv("API"))
+
+    def _count_upstream(self):
+        self.upstream_calls += 1
+
+    def _read(self, method, *args):
+        self.sync()
+        self.db_reads += 1
+        return method(*args)
+
+    def page(self, cursor: int = None, limit: int = FEED_PAGE_SIZE):
+        """
+        Página do feed por keyset: posts com id menor que `cursor`, do mais
+        novo para o mais antigo, já formatados e com autores e comentários
+        (uma consulta no `feed_dao`). Retorna (posts_da_pagina, next_cursor);
+        posts é None se a formatação falhar e `next_cursor` é None na última
+        página.
+        """
+        posts, authors, commenters, next_cursor = self._read(
+            feed_dao.page, cursor, limit
+        )
+        return hydrate_posts(posts, authors, commenters), next_cursor
+
+    def user_posts(self, user_id: int) -> list:
+        """Posts de um usuário (índice user_id do espelho), já formatados como `page`."""
+        return hydrate_posts(*self._read(feed_dao.user_posts, user_id))
+
+    def search(self, query: str) -> list:
+        """Posts crus cujo título ou conteúdo contém `query`."""
+        return self._read(post_mirror.search, query)
+
+    def banner(self):
+        """
+        Post em destaque do feed inteiro (regra FEATURED_RULE do espelho),
+        formatando só esse post em vez do feed todo.
+        """
+        featured = self._read(post_mirror.featured)
+        if featured is None:
+            return default_banner()
+        data = dataRequests([featured])
+        if isinstance(data, dict) and data.get("todos_os_posts"):
+            return data["todos_os_posts"][0]
+        return default_banner()
+
+    def count(self) -> int:
+        if self._count is None:
+            self._count = self._read(post_mirror.count)
+        return self._count
+
+    def counters(self) -> dict:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "db_reads": self.db_reads,
+        }
+
+
+def get_feed_snapshot() -> FeedSnapshot:
+    """
+    Retorna o snapshot da requisição atual (guardado em `flask.g`).
+    Fora de um contexto da aplicação devolve um snapshot avulso.
+    """
+    if not has_app_context():
+        return FeedSnapshot()
+
+    if "feed_snapshot" not in g:
+        g.feed_snapshot = FeedSnapshot()
+    return g.feed_snapshot
+
+
+def register_feed_snapshot(app):
+    """Expõe os contadores do snapshot em cada resposta (header + log)."""
+
+    @app.after_request
+    def report_feed_counters(response):
+        snapshot = g.get("feed_snapshot")
+        if snapshot is not None:
+            counters = snapshot.counters()
+            response.headers["X-Upstream-Calls"] = str(counters["upstream_calls"])
+            logging.debug(f"feed snapshot counters: {counters}")
+        return response
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from flask import render_template
+from jinja2 import pass_context
+from markupsafe import Markup
+
+# Quantidade máxima de cards renderizados guardados por processo
+FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", 2000))
+
+POST_CARD_TEMPLATE = "partials/post_card.html"
+
+
+def post_version(post: dict) -> str:
+    """
+    Versão do conteúdo de um post já formatado: muda com likes, comentários
+    (e autores enriquecidos), edição do texto, foto do autor etc.
+    """
+    return hashlib.md5(
+        json.dumps(post, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class FragmentCache:
+    """
+    Cache LRU em memória do HTML de cada card de post.
+
+    A chave é (template, id do post, versão do conteúdo, id de quem vê), então
+    um card só é renderizado de novo quando o post muda; os demais são
+    reaproveitados como estão. Versões antigas saem pelo limite do LRU.
+    """
+
+    def __init__(self, max_entries: int = FRAGMENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0}
+
+    def render(self, template: str, post: dict, viewer_id) -> Markup:
+        key = (template, post.get("id"), post_version(post), viewer_id)
+
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return html
+            self.counters["misses"] += 1
+
+        html = Markup(render_template(template, post=post, id=viewer_id))
+
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries)}
+
+
+# Cache de cards (uma instância por processo)
+fragment_cache = FragmentCache()
+
+
+def register_fragment_cache(app):
+    """
+    Disponibiliza `post_card(post, template)` nos templates. O id de quem vê
+    vem da variável `id` do template (usada no like e no form de comentário).
+    """
+
+    @pass_context
+    def post_card(context, post, template=POST_CARD_TEMPLATE):
+        return fragment_cache.render(template, post, context.get("id"))
+
+    app.jinja_env.globals["post_card"] = post_card
@@ -0,0 +1,162 @@
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+try:  # HTTP/2 é opcional: precisa do pacote `h2` (pip install httpx[http2])
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP2_ENABLED = os.getenv("HTTP2", "1") == "1" and HTTP2_AVAILABLE
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 10))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 5))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.2))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", 2))
+
+# Status que valem uma nova tentativa (apenas métodos idempotentes)
+RETRY_STATUS = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Limites (s) dos buckets do histograma de latência
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class LatencyHistogram:
+    """Histograma simples de latência (buckets cumulativos, como no Prometheus)."""
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        for index, limit in enumerate(LATENCY_BUCKETS):
+            if seconds <= limit:
+                self.buckets[index] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "errors": self.errors,
+            "buckets": {
+                f"le_{limit}": value
+                for limit, value in zip(LATENCY_BUCKETS, self.buckets)
+            },
+        }
+
+
+class ClientRegistry:
+    """
+    Clientes HTTP compartilhados, um por host e por processo (worker).
+
+    Cada cliente mantém um pool de conexões com keep-alive (e HTTP/2 quando
+    disponível), então as chamadas à API de posts e ao NYT não pagam um novo
+    handshake TCP/TLS a cada requisição.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._clients = {}
+        self._latency = {}
+
+    def _reset_after_fork(self):
+        # Conexões herdadas do processo pai não podem ser reaproveitadas
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._clients = {}
+            self._latency = {}
+
+    def client(self, host: str) -> httpx.Client:
+        with self._lock:
+            self._reset_after_fork()
+            client = self._clients.get(host)
+            if client is None:
+                client = httpx.Client(
+                    http2=HTTP2_ENABLED,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                    follow_redirects=True,
+                )
+                self._clients[host] = client
+                self._latency[host] = LatencyHistogram()
+            return client
+
+    def request(
+        self, method: str, url: str, retries: int = HTTP_RETRIES, **kwargs
+    ) -> httpx.Response:
+        """
+        Faz a requisição pelo cliente do host, com novas tentativas (backoff
+        exponencial com jitter) para erros de rede e 502/503/504.
+        """
+        if not url:
+            raise ValueError("URL não configurada")
+
+        host = urlsplit(url).netloc
+        client = self.client(host)
+        attempts = 1 + (retries if method.upper() in IDEMPOTENT_METHODS else 0)
+
+        for attempt in range(attempts):
+            started = time.perf_counter()
+            try:
+                response = client.request(method, url, **kwargs)
+            except httpx.TransportError as erro:
+                self._observe(host, time.perf_counter() - started, error=True)
+                if attempt + 1 >= attempts:
+                    raise
+                logging.warning(
+                    f"{host}: {erro.__class__.__name__}, tentativa {attempt + 1}/{attempts}"
+                )
+            else:
+                self._observe(host, time.perf_counter() - started)
+                if response.status_code not in RETRY_STATUS or attempt + 1 >= attempts:
+                    return response
+                logging.warning(
+                    f"{host}: status {response.status_code}, tentativa {attempt + 1}/{attempts}"
+                )
+
+            # Full jitter: espera aleatória entre 0 e o backoff da tentativa
+            time.sleep(
+                random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2**attempt))
+            )
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def _observe(self, host: str, seconds: float, error: bool = False):
+        with self._lock:
+            histogram = self._latency.setdefault(host, LatencyHistogram())
+            histogram.observe(seconds)
+            if error:
+                histogram.errors += 1
+
+    def metrics(self) -> dict:
+        """Histograma de latência por host."""
+        with self._lock:
+            return {
+                "http2": HTTP2_ENABLED,
+                "hosts": {
+                    host: histogram.as_dict()
+                    for host, histogram in self._latency.items()
+                },
+            }
+
+
+# Registro único por processo, usado por todos os serviços
+http_clients = ClientRegistry()
@@ -0,0 +1,77 @@
+import logging
+import os
+import threading
+from collections import defaultdict
+
+# Módulo sem dependências do Flask: a camada de banco e a API de arquivos
+# publicam eventos daqui sem import circular. Quem reage aos eventos
+# (gerações de cache, cache de perfis, cache da API) se inscreve no create_app.
+
+# Processos (workers) servindo a aplicação. O barramento é por processo:
+# com mais de um, um evento só invalida os caches do worker que fez a
+# escrita, e os caches locais (perfil_cache, gerações em um backend local)
+# passam a usar TTLs curtos (ver cache_generations / perfil_cache).
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+
+# Eventos publicados pelas rotas / funções de escrita
+POST_CREATED = "post_created"  # payload: user_id / nome
+POSTS_SYNCED = "posts_synced"  # espelho local mudou (posts novos, likes, comentários)
+PROFILE_UPDATED = "profile_updated"  # payload: user_id e/ou name
+AVATAR_CHANGED = "avatar_changed"  # payload: user_id
+BANNER_CHANGED = "banner_changed"  # payload: user_id
+
+
+class InvalidationBus:
+    """
+    Barramento síncrono de eventos de escrita.
+
+    `publish()` chama cada inscrito na hora, ainda dentro da requisição que
+    fez a escrita, o que garante read-your-writes para quem escreveu dentro
+    deste processo. Os inscritos só limpam o que é visível daqui: com
+    WEB_CONCURRENCY > 1 os outros workers só veem a escrita quando a
+    geração vive num backend compartilhado (ex: RedisCache) ou quando os
+    seus caches vencem. Uma falha em um inscrito é registrada e não impede
+    os demais.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers = defaultdict(list)
+        self.counters = defaultdict(int)
+
+    def subscribe(self, event: str, handler):
+        """
+        Inscreve `handler` em `event`. Inscrever de novo a mesma função (mesmo
+        que decorada com functools.wraps, ex: um create_app novo) substitui a
+        inscrição anterior em vez de duplicá-la.
+        """
+        target = getattr(handler, "__wrapped__", handler)
+        with self._lock:
+            handlers = [
+                current
+                for current in self._handlers[event]
+                if getattr(current, "__wrapped__", current) is not target
+            ]
+            handlers.append(handler)
+            self._handlers[event] = handlers
+
+    def publish(self, event: str, **payload):
+        with self._lock:
+            handlers = list(self._handlers[event])
+            self.counters[event] += 1
+
+        for handler in handlers:
+            try:
+                handler(**payload)
+            except Exception as erro:
+                logging.error(
+                    f"invalidação '{event}': {handler.__name__} falhou: {erro.__class__.__name__}"
+                )
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+
+# Barramento único por processo
+bus = InvalidationBus()
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from application.src.services.invalidation import WEB_CONCURRENCY
+
+# Módulo sem dependências do Flask/rotas: pode ser importado por qualquer
+# camada (banco, API de arquivos, serviços) sem import circular.
+
+# Quantidade máxima de perfis guardados por processo
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 1000))
+# Tempo (s) de vida de cada perfil em cache. As escritas invalidam antes
+# disso, mas só no processo que escreveu: com vários workers o TTL é o
+# limite de tempo em que os outros podem servir um perfil antigo.
+PROFILE_CACHE_TTL = float(
+    os.getenv("PROFILE_CACHE_TTL", 3600 if WEB_CONCURRENCY <= 1 else 30)
+)
+
+
+class ProfileCache:
+    """
+    Cache read-through (LRU + TTL) dos dados de perfil em `usuarios`.
+
+    As chaves são ("id", 1) ou ("name", "Ana"): cada argumento tem sua própria
+    entrada, então buscar o autor B nunca devolve o perfil do autor A. As
+    rotas de escrita publicam eventos no barramento de invalidação, que
+    chamam `invalidate()` logo depois do commit. O cache é por processo:
+    outro worker só descarta a entrada pelo TTL (PROFILE_CACHE_TTL).
+
+    O `loader()` roda fora do lock. Cada `invalidate()` carimba as chaves
+    do usuário com um número de sequência, e uma leitura só guarda o que
+    carregou se nenhuma das suas chaves foi carimbada depois do início da
+    leitura. Assim um perfil lido antes do commit não volta ao cache.
+    """
+
+    def __init__(
+        self, max_entries: int = PROFILE_CACHE_SIZE, ttl: float = PROFILE_CACHE_TTL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # chave -> (perfil, expira_em)
+        self._sequence = 0  # Conta as invalidações
+        self._invalidated_at = {}  # ("id", 1) / ("name", "Ana") -> sequência da última
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "invalidations": 0,
+            "discarded": 0,
+        }
+
+    def get(self, key: tuple, loader):
+        """Devolve o perfil de `key`, chamando `loader()` se não estiver em cache."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                profile, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return dict(profile)
+                del self._entries[key]
+                self.counters["expired"] += 1
+            self.counters["misses"] += 1
+            started_at = self._sequence
+
+        profile = loader()
+        if profile is None:
+            # Usuário inexistente (ou ainda sendo cadastrado): não fica em cache
+            return None
+
+        keys = (key, ("id", profile.get("id")), ("name", profile.get("username")))
+        with self._lock:
+            if any(self._invalidated_at.get(k, 0) > started_at for k in keys):
+                # Invalidado durante a leitura: devolve, mas não guarda
+                self.counters["discarded"] += 1
+                return profile
+            self._entries[key] = (dict(profile), now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return profile
+
+    def invalidate(self, user_id=None, name=None):
+        """Remove todas as entradas do usuário (por id e por nome)."""
+        user_id = int(user_id) if str(user_id).isdigit() else None
+        with self._lock:
+            self._sequence += 1
+            for key in (("id", user_id), ("name", name)):
+                if key[1] is not None:
+                    self._invalidated_at[key] = self._sequence
+            stale = [
+                key
+                for key, (profile, _) in self._entries.items()
+                if key in (("id", user_id), ("name", name))
+                or (user_id is not None and profile.get("id") == user_id)
+                or (name is not None and profile.get("username") == name)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.counters["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries), "ttl": self.ttl}
+
+
+# Cache de perfis (uma instância por processo)
+profile_cache = ProfileCache()
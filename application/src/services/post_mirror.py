@@ -0,0 +1,332 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from application.src.database.conexao import in_chunks, posts_db
+from application.src.services.invalidation import POSTS_SYNCED, bus
+
+# Quantidade de linhas por lote nos upserts
+SYNC_BATCH_SIZE = int(os.getenv("SYNC_BATCH_SIZE", 500))
+
+POST_COLUMNS = "id, user_id, nome, titulo, post, likes, img_url, data"
+
+# Regra do post em destaque (banner do feed):
+#   first_liked  -> primeiro post com ao menos FEATURED_MIN_LIKES likes (padrão)
+#   most_liked   -> post com mais likes
+#   most_liked_window -> post com mais likes nas últimas FEATURED_WINDOW_HOURS horas
+FEATURED_RULE = os.getenv("FEATURED_RULE", "first_liked")
+FEATURED_MIN_LIKES = int(os.getenv("FEATURED_MIN_LIKES", 1))
+FEATURED_WINDOW_HOURS = float(os.getenv("FEATURED_WINDOW_HOURS", 24))
+# Na regra com janela o destaque é recalculado ao menos a cada N segundos
+FEATURED_REFRESH = float(os.getenv("FEATURED_REFRESH", 60))
+
+FEATURED_RULES = {
+    "first_liked": ("likes >= ?", "id ASC"),
+    "most_liked": ("likes >= ?", "likes DESC, id DESC"),
+    "most_liked_window": (
+        "likes >= ? AND datetime(substr(data, 1, 19)) >= datetime(?)",
+        "likes DESC, id DESC",
+    ),
+}
+
+
+def _post_version(post: dict) -> str:
+    """Hash do post como veio da API: muda com likes, comentários, edição etc."""
+    return hashlib.md5(
+        json.dumps(post, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _casefold(text):
+    return text.lower() if isinstance(text, str) else ""
+
+
+class PostMirror:
+    """
+    Espelho local (banco_posts_comunidade.db) dos posts e comentários da API.
+
+    `sync()` recebe a lista da API e grava em lotes apenas o que mudou:
+    posts com id acima do cursor são inseridos, posts cujo hash mudou são
+    atualizados (junto com os comentários) e posts que sumiram da API são
+    removidos. Feed, perfil e busca consultam as tabelas indexadas em vez de
+    baixar e processar a lista inteira.
+    """
+
+    def __init__(self, source: str = "posts_api"):
+        self.source = source
+        self._lock = threading.Lock()
+        self._last_payload = None  # Último payload sincronizado neste processo
+        self._featured = None  # (post em destaque, momento do cálculo)
+        self.counters = {
+            "syncs": 0,
+            "skipped": 0,  # Payload igual ao último (ex: 304 da API)
+            "inserted": 0,
+            "updated": 0,
+            "deleted": 0,
+        }
+
+    def sync(self, posts: list) -> bool:
+        """
+        Sincroniza `posts` (lista da API) com o espelho.
+        Retorna True se alguma linha mudou.
+        """
+        changed = self._sync(posts)
+        if changed:
+            # Fora do lock: os inscritos podem ler o espelho
+            bus.publish(POSTS_SYNCED)
+        return changed
+
+    def _sync(self, posts: list) -> bool:
+        with self._lock:
+            if posts is self._last_payload:
+                self.counters["skipped"] += 1
+                return False
+
+            valid = [
+                post
+                for post in posts or []
+                if isinstance(post, dict) and str(post.get("id", "")).isdigit()
+            ]
+
+            with posts_db() as banco:
+                cursor = banco.cursor()
+                cursor.execute(
+                    "SELECT cursor FROM sincronizacao WHERE fonte = ?", (self.source,)
+                )
+                row = cursor.fetchone()
+                since_id = row[0] if row else 0
+
+                cursor.execute("SELECT id, versao FROM post_espelho")
+                stored = dict(cursor.fetchall())
+
+                changed = []
+                for post in valid:
+                    version = _post_version(post)
+                    if stored.get(int(post["id"])) != version:
+                        changed.append((post, version))
+
+                api_ids = {int(post["id"]) for post in valid}
+                removed = [post_id for post_id in stored if post_id not in api_ids]
+
+                for start in range(0, len(changed), SYNC_BATCH_SIZE):
+                    self._upsert(cursor, changed[start : start + SYNC_BATCH_SIZE])
+                self._delete(cursor, removed)
+
+                new_cursor = max(api_ids, default=since_id)
+                cursor.execute(
+                    """
+                    INSERT INTO sincronizacao (fonte, cursor, atualizado_em)
+                    VALUES (?, ?, datetime('now', 'localtime'))
+                    ON CONFLICT(fonte) DO UPDATE SET
+                        cursor = excluded.cursor,
+                        atualizado_em = excluded.atualizado_em
+                    """,
+                    (self.source, new_cursor),
+                )
+                banco.commit()
+
+            inserted = sum(1 for post, _ in changed if int(post["id"]) > since_id)
+            self.counters["syncs"] += 1
+            self.counters["inserted"] += inserted
+            self.counters["updated"] += len(changed) - inserted
+            self.counters["deleted"] += len(removed)
+            self._last_payload = posts
+            # Novos posts ou likes alterados (aqui ou em outro worker): recalcula
+            # o destaque na próxima leitura
+            self._featured = None
+
+            logging.debug(
+                f"post mirror: {inserted} novos, {len(changed) - inserted} atualizados, "
+                f"{len(removed)} removidos (cursor {since_id} -> {new_cursor})"
+            )
+            return bool(changed or removed)
+
+    def _upsert(self, cursor, batch):
+        cursor.executemany(
+            f"""
+            INSERT INTO post_espelho ({POST_COLUMNS}, versao)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                user_id = excluded.user_id,
+                nome = excluded.nome,
+                titulo = excluded.titulo,
+                post = excluded.post,
+                likes = excluded.likes,
+                img_url = excluded.img_url,
+                data = excluded.data,
+                versao = excluded.versao
+            """,
+            [
+                (
+                    int(post["id"]),
+                    post.get("user_id"),
+                    post.get("nome"),
+                    post.get("titulo"),
+                    post.get("post"),
+                    post.get("likes", 0),
+                    post.get("img_url"),
+                    post.get("data"),
+                    version,
+                )
+                for post, version in batch
+            ],
+        )
+
+        # Comentários dos posts alterados são regravados por inteiro
+        post_ids = [int(post["id"]) for post, _ in batch]
+        self._delete_comments(cursor, post_ids)
+        cursor.executemany(
+            """
+            INSERT INTO comentario_espelho (post_id, comment_id, user_id, comment, creation_date)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    int(post["id"]),
+                    comment.get("comment_id"),
+                    comment.get("user_id"),
+                    comment.get("comment"),
+                    comment.get("creation_date"),
+                )
+                for post, _ in batch
+                if isinstance(post.get("comments"), list)
+                for comment in post["comments"]
+                if isinstance(comment, dict)
+            ],
+        )
+
+    def _delete_comments(self, cursor, post_ids):
+        for chunk, placeholders in in_chunks(post_ids):
+            cursor.execute(
+                f"DELETE FROM comentario_espelho WHERE post_id IN ({placeholders})",
+                chunk,
+            )
+
+    def _delete(self, cursor, post_ids):
+        for chunk, placeholders in in_chunks(post_ids):
+            cursor.execute(
+                f"DELETE FROM post_espelho WHERE id IN ({placeholders})", chunk
+            )
+        self._delete_comments(cursor, post_ids)
+
+    # Leituras -------------------------------------------------------------
+
+    def _read(
+        self, where: str = "", params=(), order: str = "id DESC", limit: int = None
+    ) -> list:
+        """Lê posts do espelho já no formato da API (com `comments`)."""
+        sql = f"SELECT {POST_COLUMNS} FROM post_espelho {where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+
+        with posts_db(readonly=True) as banco:
+            banco.create_function("casefold", 1, _casefold, deterministic=True)
+            cursor = banco.cursor()
+            cursor.execute(sql, params)
+            posts = [
+                {
+                    "id": row[0],
+                    "user_id": row[1],
+                    "nome": row[2],
+                    "titulo": row[3],
+                    "post": row[4],
+                    "likes": row[5],
+                    "img_url": row[6],
+                    "data": row[7],
+                    "comments": [],
+                }
+                for row in cursor.fetchall()
+            ]
+
+            by_id = {post["id"]: post for post in posts}
+            for chunk, placeholders in in_chunks(by_id):
+                cursor.execute(
+                    f"""
+                    SELECT post_id, comment_id, user_id, comment, creation_date
+                    FROM comentario_espelho
+                    WHERE post_id IN ({placeholders})
+                    ORDER BY rowid
+                    """,
+                    chunk,
+                )
+                for (
+                    post_id,
+                    comment_id,
+                    user_id,
+                    comment,
+                    creation_date,
+                ) in cursor.fetchall():
+                    by_id[post_id]["comments"].append(
+                        {
+                            "comment_id": comment_id,
+                            "user_id": user_id,
+                            "comment": comment,
+                            "creation_date": creation_date,
+                        }
+                    )
+        return posts
+
+    def page(self, cursor: int = None, limit: int = 20):
+        """Keyset: posts com id < cursor, do mais novo para o mais antigo."""
+        if cursor is None:
+            posts = self._read(limit=limit + 1)
+        else:
+            posts = self._read("WHERE id < ?", (cursor,), limit=limit + 1)
+        has_more = len(posts) > limit
+        posts = posts[:limit]
+        next_cursor = posts[-1]["id"] if posts and has_more else None
+        return posts, next_cursor
+
+    def user_posts(self, user_id: int) -> list:
+        return self._read("WHERE user_id = ?", (user_id,))
+
+    def search(self, query: str) -> list:
+        """Posts cujo título ou conteúdo contém `query` (sem diferenciar maiúsculas)."""
+        term = _casefold(query)
+        return self._read(
+            "WHERE instr(casefold(titulo), ?) > 0 OR instr(casefold(post), ?) > 0",
+            (term, term),
+        )
+
+    def featured(self):
+        """
+        Post em destaque segundo FEATURED_RULE. O resultado fica em memória e
+        só é recalculado depois de uma sincronização (ou do FEATURED_REFRESH
+        na regra com janela), então o banner não varre os posts a cada página.
+        """
+        cached = self._featured
+        if cached is not None:
+            post, computed_at = cached
+            if (
+                FEATURED_RULE != "most_liked_window"
+                or time.monotonic() - computed_at < FEATURED_REFRESH
+            ):
+                return post
+
+        where, order = FEATURED_RULES.get(FEATURED_RULE, FEATURED_RULES["first_liked"])
+        params = (FEATURED_MIN_LIKES,)
+        if FEATURED_RULE == "most_liked_window":
+            since = datetime.now() - timedelta(hours=FEATURED_WINDOW_HOURS)
+            params += (since.strftime("%Y-%m-%d %H:%M:%S"),)
+
+        posts = self._read(f"WHERE {where}", params, order=order, limit=1)
+        post = posts[0] if posts else None
+        self._featured = (post, time.monotonic())
+        return post
+
+    def count(self) -> int:
+        with posts_db(readonly=True) as banco:
+            return banco.execute("SELECT COUNT(*) FROM post_espelho").fetchone()[0]
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+
+# Espelho da API de posts (uma instância por processo)
+post_mirror = PostMirror()
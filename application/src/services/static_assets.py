@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+
+from flask import current_app, request, send_from_directory
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+from application.src.services.compression import ENCODING_SUFFIXES, negotiate_encoding
+
+# CSS/JS recebem ?v=<hash do conteúdo> no url_for e podem ficar em cache "para sempre"
+FINGERPRINT_EXTENSIONS = {".css", ".js"}
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# Fotos e banners podem ser sobrescritos com o mesmo nome: cache curto + ETag forte
+MEDIA_MAX_AGE = int(os.getenv("MEDIA_MAX_AGE", 3600))
+
+
+class ContentHashes:
+    """
+    SHA-256 do conteúdo de cada arquivo, recalculado apenas quando o
+    mtime/tamanho muda (um os.stat por consulta em vez de ler o arquivo).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._digests = {}  # caminho -> (mtime_ns, tamanho, hash)
+
+    def digest(self, path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(64 * 1024), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+
+content_hashes = ContentHashes()
+
+
+def asset_version(filename: str):
+    """Versão (prefixo do hash) de um CSS/JS de /static, ou None."""
+    if os.path.splitext(filename)[1].lower() not in FINGERPRINT_EXTENSIONS:
+        return None
+    path = safe_join(current_app.static_folder, filename)
+    digest = content_hashes.digest(path) if path else None
+    return digest[:12] if digest else None
+
+
+def add_fingerprint(endpoint, values):
+    """url_defaults: url_for('static', filename='css/output.css') -> ...?v=<hash>."""
+    if endpoint != "static" or "v" in values or "filename" not in values:
+        return
+    version = asset_version(values["filename"])
+    if version:
+        values["v"] = version
+
+
+def cache_static_response(response):
+    """URLs com a versão atual do arquivo ficam em cache como `immutable`."""
+    if request.endpoint != "static" or response.status_code not in (200, 304):
+        return response
+
+    version = request.args.get("v")
+    filename = (request.view_args or {}).get("filename", "")
+    if version and version == asset_version(filename):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+
+def send_media(directory: str, filename: str, max_age: int = MEDIA_MAX_AGE, **kwargs):
+    """
+    send_from_directory com ETag forte baseado no conteúdo: If-None-Match
+    com o mesmo hash devolve 304 sem reenviar a imagem.
+    """
+    # Pastas relativas (ex: `caminho_img`) são relativas à raiz do projeto,
+    # onde os uploads são gravados, e não ao root_path do Flask
+    directory = os.path.abspath(directory)
+    path = safe_join(directory, filename)
+    digest = content_hashes.digest(path) if path else None
+    if digest is None:
+        raise NotFound()
+    return send_from_directory(
+        directory, filename, etag=digest, max_age=max_age, **kwargs
+    )
+
+
+def serve_static(app, filename):
+    """
+    Substitui o handler de /static (ETag pelo conteúdo via `send_media`).
+    Se existir o irmão `.br`/`.gz` gerado pelo build (e não for mais antigo
+    que o original), envia ele com o Content-Encoding certo, sem gastar CPU
+    comprimindo de novo.
+    """
+    encoding = negotiate_encoding()
+    if encoding is not None:
+        sibling = filename + ENCODING_SUFFIXES[encoding]
+        original_path = safe_join(app.static_folder, filename)
+        sibling_path = safe_join(app.static_folder, sibling)
+        try:
+            fresh = os.path.getmtime(sibling_path) >= os.path.getmtime(original_path)
+        except (OSError, TypeError):  # TypeError: caminho recusado pelo safe_join
+            fresh = False
+
+        if fresh:
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            try:
+                response = send_media(app.static_folder, sibling, mimetype=mimetype)
+            except NotFound:
+                logging.debug(f"static: {sibling} sumiu, servindo o original")
+            else:
+                response.headers["Content-Encoding"] = encoding
+                response.vary.add("Accept-Encoding")
+                return response
+
+    return send_media(app.static_folder, filename)
+
+
+def register_static_assets(app):
+    app.url_defaults(add_fingerprint)
+    app.after_request(cache_static_response)
+    app.view_functions["static"] = lambda filename: serve_static(app, filename)
@@ -0,0 +1,193 @@
+import logging
+import os
+import threading
+import time
+
+import httpx
+
+from application.src.services.http_clients import http_clients
+
+# Tempo (s) em que o payload é considerado fresco
+API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", 30))
+# Acima desse tempo (s) a leitura espera a atualização em vez de servir o antigo
+API_CACHE_MAX_STALE = float(os.getenv("API_CACHE_MAX_STALE", 600))
+
+
+class UpstreamCache:
+    """
+    Cache stale-while-revalidate para um endpoint JSON externo.
+
+    Guarda o último payload válido e o devolve na hora. Depois do TTL, a
+    atualização roda em segundo plano com `If-None-Match` / `If-Modified-Since`,
+    então um feed sem mudanças custa apenas um 304. Se a API falhar, o último
+    payload bom continua sendo servido. Os inscritos (`subscribe`) recebem
+    cada payload novo, venha ele de uma leitura ou da atualização em segundo
+    plano.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float = API_CACHE_TTL,
+        max_stale: float = API_CACHE_MAX_STALE,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max_stale
+
+        self._lock = threading.Lock()
+        self._payload = None
+        self._etag = None
+        self._last_modified = None
+        self._fetched_at = 0.0
+        self._refreshing = False
+        self._listeners = []
+
+        self.counters = {
+            "hits": 0,  # Payload fresco
+            "stale_hits": 0,  # Payload vencido servido enquanto atualiza
+            "misses": 0,  # Sem payload: a leitura esperou a API
+            "refreshes": 0,  # Requisições feitas à API
+            "not_modified": 0,  # Respostas 304
+            "errors": 0,
+        }
+
+    def subscribe(self, listener):
+        """`listener(payload)` é chamado a cada payload novo (não em um 304)."""
+        self._listeners.append(listener)
+
+    def get(self, url: str, on_request=None):
+        """
+        Retorna o payload em cache, atualizando-o conforme o TTL.
+        `on_request()` é chamado se esta leitura esperar uma requisição à API.
+        """
+        with self._lock:
+            payload = self._payload
+            age = time.monotonic() - self._fetched_at
+
+        if payload is None or age > self.max_stale:
+            self._count("misses")
+            return self.refresh(url, on_request)
+
+        if age > self.ttl:
+            self._count("stale_hits")
+            self._refresh_in_background(url)
+        else:
+            self._count("hits")
+        return payload
+
+    def revalidate(self, url: str):
+        """
+        Sem bloquear: se o payload venceu, agenda a atualização em segundo
+        plano e os inscritos recebem o resultado. Sem payload não faz nada: a
+        primeira leitura (`get`) já espera a API.
+        """
+        with self._lock:
+            expired = (
+                self._payload is not None
+                and time.monotonic() - self._fetched_at > self.ttl
+            )
+        if expired:
+            self._refresh_in_background(url)
+
+    def refresh(self, url: str, on_request=None):
+        """Busca a URL (requisição condicional) e devolve o payload mais recente."""
+        headers = {}
+        with self._lock:
+            if self._payload is not None:
+                if self._etag:
+                    headers["If-None-Match"] = self._etag
+                if self._last_modified:
+                    headers["If-Modified-Since"] = self._last_modified
+
+        self._count("refreshes")
+        if on_request is not None:
+            on_request()
+        try:
+            response = http_clients.get(url, headers=headers, timeout=10)
+        except (httpx.HTTPError, ValueError) as erro:
+            # ValueError: URL ausente ou inválida no .env
+            self._count("errors")
+            logging.error(
+                f"{self.name}: falha ao acessar a API: {erro.__class__.__name__}"
+            )
+            return self._payload
+
+        if response.status_code == 304:
+            self._count("not_modified")
+            with self._lock:
+                self._fetched_at = time.monotonic()
+                return self._payload
+
+        if not response.is_success:
+            self._count("errors")
+            logging.error(f"{self.name}: erro na API: {response.status_code}")
+            return self._payload
+
+        try:
+            payload = response.json()
+        except ValueError:
+            self._count("errors")
+            logging.error(f"{self.name}: erro ao converter a resposta para JSON")
+            return self._payload
+
+        with self._lock:
+            self._payload = payload
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            self._fetched_at = time.monotonic()
+
+        for listener in self._listeners:
+            try:
+                listener(payload)
+            except Exception as erro:
+                logging.error(
+                    f"{self.name}: falha ao notificar um inscrito: {erro.__class__.__name__}"
+                )
+        return payload
+
+    def invalidate(self):
+        """Marca o payload como vencido: a próxima leitura espera a API."""
+        with self._lock:
+            self._fetched_at = float("-inf")
+
+    def _refresh_in_background(self, url: str):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh(url)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name=f"{self.name}-refresh", daemon=True).start()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counters[key] += 1
+
+    def metrics(self) -> dict:
+        """Contadores + idade do payload, para ajustar o TTL."""
+        with self._lock:
+            staleness = (
+                time.monotonic() - self._fetched_at
+                if self._payload is not None
+                else None
+            )
+            return {
+                **self.counters,
+                "ttl": self.ttl,
+                "staleness_seconds": round(staleness, 3)
+                if staleness is not None
+                else None,
+                "has_etag": bool(self._etag),
+                "has_last_modified": bool(self._last_modified),
+            }
+
+
+# Cache da API de posts (uma instância por processo)
+posts_cache = UpstreamCache("posts_api")
@@ -1,25 +1,34 @@
-from flask import flash, redirect, url_for
-from application.src.database.users.configure_users import my_db
-from application.src.services.api_service import dataRequests
 import logging
+from contextlib import contextmanager
+from functools import partial
 
+from application.src.database.conexao import users_db
+from application.src.services.api_service import format_posts
+from application.src.services.perfil_cache import profile_cache
 
 
-
-def get_user_info(user_id):  # Busca por ID | usuario logado | Dono da conta
-    banco, cursor = my_db()
-
-    # Buscar informações completas do usuário no banco
-    cursor.execute(
-        'SELECT id, photo, bio, github, likedin, site, followers, following, banner, name FROM usuarios WHERE id = ?',
-        (user_id,)
-    )
-    user = cursor.fetchone()
-    print(user)
+@contextmanager
+def limited_db():
+    """
+    Cursor somente leitura em usuarios.db, emprestado do pool de conexões
+    (o tamanho do pool, DB_POOL_SIZE, limita as conexões abertas).
+    """
+    with users_db(readonly=True) as banco:
+        yield banco.cursor()
+
+
+def _load_user_info(column: str, value):
+    with limited_db() as cursor:
+        # Buscar informações completas do usuário no banco
+        cursor.execute(
+            f'SELECT id, photo, bio, github, likedin, site, followers, following, banner, name FROM usuarios WHERE {column} = ?',
+            (value,)
+        )
+        user = cursor.fetchone()
    
 
     if not user:
-        logging.warning(f"User with ID {user_id} not found.")
+        logging.warning(f"User with {column} {value} not found.")
         return None  # Ou uma lista vazia, dependendo do contexto
 
     return {
@@ -36,19 +45,27 @@ def get_user_info(user_id):  # Busca por ID | usuario logado | Dono da conta
 }
 
 
+def get_user_info(user_id):  # Busca por ID | usuario logado | Dono da conta
+    # Leitura via `profile_cache` (LRU + TTL), invalidado pelas rotas de escrita
+    return profile_cache.get(("id", int(user_id)), partial(_load_user_info, "id", user_id))
+
+
+def get_user_info_by_name(name):  # Busca por `usuarios.name`
+    return profile_cache.get(("name", name), partial(_load_user_info, "name", name))
+
 
-    
 
-def UserData(usuario): # This function receives current_user.id:
-    banco, cursor = my_db()  # Devemos usar essa função para mostra recomendaçoes no celular
     
 
-    # Fetch the logged-in user's information:
-    cursor.execute(
-        'SELECT id, name,  occupation FROM user_information WHERE id = ?',
-        (usuario,)
-    )
-    user = cursor.fetchone()
+def UserData(usuario): # This function receives current_user.id:
+    # Devemos usar essa função para mostra recomendaçoes no celular
+    with limited_db() as cursor:
+        # Fetch the logged-in user's information:
+        cursor.execute(
+            'SELECT id, name,  occupation FROM user_information WHERE id = ?',
+            (usuario,)
+        )
+        user = cursor.fetchone()
    
     if not user:
         # caso o usuario / user_id não for encontrado
@@ -62,35 +79,15 @@ def UserData(usuario): # This function receives current_user.id:
     'occupation': user[2].capitalize()
 }
 
-def get_infor_comment(user_id):
-    banco, cursor = my_db()
-
-    # Consulta as informações do usuário
-    cursor.execute(
-        'SELECT id, name, photo FROM usuarios WHERE id = ?',
-        (user_id,)
-    )
-    user = cursor.fetchone()
-
-    if not user:
-        logging.info('user not found')
-        return None
-
-    return {
-        'id': user[0],
-        'username': user[1],
-        'photo': user[2] or 'icon/default.svg'  # Foto padrão
-    }
-
-
-def enrich_posts_with_user_info(posts):
+def enrich_posts_with_user_info(posts, authors: dict):
     """
     Enriquecimento dos posts com id e nome dos usuários nos comentários.
     Essa função buscar pegar o id do usuario que comentou em um post, com o id do usuario buscamos informaçoes sobre 
-    ele. como (foto e nome).
+    ele. como (foto e nome). Os dados de quem comentou já chegam em `authors`
+    ({id: dados}, da mesma consulta do `feed_dao`).
     """
     enriched_posts = []
-    
+
     for post in posts:
         # Garantir que a chave 'comments' é uma lista
         if 'comments' not in post or not isinstance(post['comments'], list):
@@ -101,7 +98,7 @@ def enrich_posts_with_user_info(posts):
             # Certifique-se de que 'user_id' existe no comentário
             if 'user_id' in comment:
                 user_id = comment['user_id']
-                user_info = get_infor_comment(user_id)
+                user_info = authors.get(int(user_id)) if str(user_id).isdigit() else None
                 if user_info:
                     # Enriquecer o comentário apenas com 'id' e 'username'
                     comment['user_id'] = user_info['id']
@@ -120,3 +117,21 @@ def enrich_posts_with_user_info(posts):
 
     return enriched_posts
 
+
+def hydrate_posts(posts: list, authors: dict, commenters: dict) -> list:
+    """
+    Formata posts lidos pelo `feed_dao` (autores e comentaristas já vieram
+    na mesma consulta) com as mesmas regras de `dataRequests` +
+    `enrich_posts_with_user_info`, sem nenhuma consulta ao banco.
+    """
+    db_data = {
+        "user_photos": {name: author["photo"] for name, author in authors.items()},
+        "user_usernames": {
+            name: {"username": author["username"], "occupation": author["occupation"]}
+            for name, author in authors.items() if author["username"]
+        },
+    }
+    data = format_posts(posts, db_data)
+    if not isinstance(data, dict) or "todos_os_posts" not in data:
+        return None
+    return enrich_posts_with_user_info(data["todos_os_posts"], commenters)
@@ -0,0 +1,67 @@
+// Infinite scroll do feed: busca a próxima página (?cursor=&limit=) como
+// fragmento HTML e adiciona os cards no final da lista.
+document.addEventListener('DOMContentLoaded', () => {
+  const container = document.getElementById('feed-posts');
+  const sentinel = document.getElementById('feed-sentinel');
+
+  if (!container || !sentinel) {
+    return;
+  }
+
+  let loading = false;
+
+  async function loadNextPage() {
+    const cursor = container.dataset.nextCursor;
+    if (loading || !cursor) {
+      return;
+    }
+    loading = true;
+
+    const params = new URLSearchParams({ cursor, limit: container.dataset.limit || '' });
+
+    try {
+      const response = await fetch(`${window.location.pathname}?${params}`, {
+        headers: { 'X-Requested-With': 'fetch' },
+        credentials: 'same-origin',
+      });
+
+      if (!response.ok) {
+        console.error('Erro ao carregar mais posts:', response.status);
+        return;
+      }
+
+      const html = await response.text();
+      const template = document.createElement('template');
+      template.innerHTML = html;
+
+      // Destaque de código apenas nos cards novos
+      template.content.querySelectorAll('pre code').forEach((block) => {
+        if (window.hljs) {
+          hljs.highlightElement(block);
+        }
+      });
+
+      container.appendChild(template.content);
+      container.dataset.nextCursor = response.headers.get('X-Next-Cursor') || '';
+
+      if (!container.dataset.nextCursor) {
+        observer.disconnect();
+      }
+    } catch (error) {
+      console.error('Erro de conexão ao carregar mais posts:', error);
+    } finally {
+      loading = false;
+    }
+  }
+
+  const observer = new IntersectionObserver(
+    (entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        loadNextPage();
+      }
+    },
+    { rootMargin: '600px' }
+  );
+
+  observer.observe(sentinel);
+});
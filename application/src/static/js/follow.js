@@ -0,0 +1,42 @@
+// Botões de seguir (perfil e cards do feed): PUT segue, DELETE deixa de seguir.
+// O estado inicial vem do servidor em data-following; a rota é idempotente,
+// então um clique repetido não altera os contadores.
+document.addEventListener('click', async function (event) {
+  const button = event.target.closest('.follow-button');
+  if (!button || button.disabled) {
+    return;
+  }
+
+  const userId = button.dataset.userId;
+  const following = button.dataset.following === 'true';
+
+  button.disabled = true;
+  try {
+    const response = await fetch(`/devorbit/follow/${userId}/`, {
+      method: following ? 'DELETE' : 'PUT',
+      credentials: 'same-origin',
+    });
+
+    if (!response.ok) {
+      console.error('Erro ao seguir usuário:', response.status);
+      return;
+    }
+
+    const data = await response.json();
+    // Todos os botões do mesmo autor (vários posts na página)
+    document.querySelectorAll(`.follow-button[data-user-id="${userId}"]`).forEach(other => {
+      other.dataset.following = String(data.following);
+      other.textContent = data.following ? 'Seguindo' : 'Seguir';
+    });
+
+    // Contador de seguidores do perfil aberto
+    const counter = document.querySelector(`[data-followers-count="${userId}"]`);
+    if (counter) {
+      counter.textContent = data.followers;
+    }
+  } catch (error) {
+    console.error('Erro na requisição:', error);
+  } finally {
+    button.disabled = false;
+  }
+});
@@ -112,8 +112,12 @@ document.addEventListener('DOMContentLoaded', function () {
 });
 
 document.addEventListener('DOMContentLoaded', () => {
-  document.querySelectorAll('form[id^="comment-form-"]').forEach((form) => {
-    form.addEventListener('submit', async (event) => {
+  // Delegado no document para funcionar também nos cards do infinite scroll
+  document.addEventListener('submit', async (event) => {
+      const form = event.target.closest('form[id^="comment-form-"]');
+      if (!form) {
+        return;
+      }
       event.preventDefault();
       
       const postId = form.querySelector('input[name="post_id"]').value.trim();
@@ -148,7 +152,6 @@ document.addEventListener('DOMContentLoaded', () => {
       } catch (error) {
         alert('Erro ao processar o comentário. Verifique sua conexão.');
       }
-    });
   });
 });
 
@@ -1,9 +1,12 @@
 document.addEventListener('DOMContentLoaded', function () {
   // Função para lidar com o envio do like
-  const likeButtons = document.querySelectorAll('.like-button');
+  // (delegado no document para funcionar também nos cards do infinite scroll)
+  document.addEventListener('click', async function (event) {
+      const button = event.target.closest('.like-button');
+      if (!button) {
+        return;
+      }
 
-  likeButtons.forEach(button => {
-    button.addEventListener('click', async function () {
       const postId = button.getAttribute('data-id'); // ID do post
       const userId = button.getAttribute('data-user-id'); // ID do usuário
 
@@ -44,7 +47,6 @@ document.addEventListener('DOMContentLoaded', function () {
         console.error('Erro de conexão com a API:', error);
         alert('Erro ao processar o like. Verifique sua conexão.');
       }
-    });
   });
 
   // Função para lidar com o clique na imagem
@@ -0,0 +1,100 @@
+"""
+Gera os irmãos `.br` / `.gz` dos arquivos de application/src/static.
+
+Rode depois de gerar o CSS (npm run dev / tailwind) e antes do deploy:
+
+    python -m application.src.utils.precompress
+
+O handler de /static (services/compression.py) envia esses arquivos direto
+quando o navegador aceita o encoding, sem comprimir a cada requisição.
+Arquivos pré-comprimidos mais antigos que o original são ignorados pelo
+handler, então rodar o build de novo é sempre seguro.
+"""
+
+import argparse
+import logging
+import os
+import zlib
+
+from application.src.services.compression import (
+    BROTLI_AVAILABLE,
+    ENCODING_SUFFIXES,
+    compress,
+)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
+
+# Só texto: imagens (png, jpg, webp) já são comprimidas
+PRECOMPRESS_EXTENSIONS = {
+    ".css",
+    ".js",
+    ".html",
+    ".svg",
+    ".json",
+    ".txt",
+    ".map",
+    ".ico",
+}
+
+
+def precompress(directory: str = STATIC_DIR, min_size: int = 256) -> dict:
+    """Escreve `.br`/`.gz` ao lado de cada arquivo elegível. Retorna contadores."""
+    encodings = ["gzip"] + (["br"] if BROTLI_AVAILABLE else [])
+    levels = {"gzip": zlib.Z_BEST_COMPRESSION, "br": 11}
+    counters = {"files": 0, "written": 0, "skipped": 0, "bytes_in": 0, "bytes_out": 0}
+
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.splitext(name)[1].lower() not in PRECOMPRESS_EXTENSIONS:
+                continue
+            if os.path.getsize(path) < min_size:
+                continue
+
+            counters["files"] += 1
+            with open(path, "rb") as original:
+                data = original.read()
+
+            for encoding in encodings:
+                target = path + ENCODING_SUFFIXES[encoding]
+                if os.path.exists(target) and os.path.getmtime(
+                    target
+                ) >= os.path.getmtime(path):
+                    counters["skipped"] += 1
+                    continue
+
+                compressed = compress(data, encoding, level=levels[encoding])
+                if len(compressed) >= len(data):
+                    continue  # Não compensa: o handler serve o original
+
+                with open(target, "wb") as output:
+                    output.write(compressed)
+                counters["written"] += 1
+                counters["bytes_in"] += len(data)
+                counters["bytes_out"] += len(compressed)
+
+    return counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", default=STATIC_DIR, help="pasta de arquivos estáticos")
+    parser.add_argument(
+        "--min-size", type=int, default=256, help="tamanho mínimo (bytes)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    if not BROTLI_AVAILABLE:
+        logging.warning("pacote `brotli` não instalado: gerando apenas .gz")
+
+    counters = precompress(args.dir, args.min_size)
+    logging.info(
+        f"{counters['files']} arquivos, {counters['written']} gerados, "
+        f"{counters['skipped']} já atualizados "
+        f"({counters['bytes_in']} -> {counters['bytes_out']} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+Auditoria dos planos de consulta de todo SQL da aplicação.
+
+Varre o código (AST) atrás das strings SQL (SELECT/UPDATE/DELETE/INSERT),
+cria os dois bancos em uma pasta temporária pelas migrações, popula com
+dados de exemplo + ANALYZE e roda `EXPLAIN QUERY PLAN` em cada consulta.
+Um `SCAN <tabela>` sem índice é uma varredura completa:
+
+    python -m application.src.utils.query_audit          # relatório
+    python -m application.src.utils.query_audit --check  # falha (exit 1) se houver varredura nova
+
+SQL montado com f-string precisa de variantes em `DYNAMIC_VARIANTS` (local
+-> (rótulo, valores das partes dinâmicas)); sem elas a consulta não pode ser
+auditada e o --check falha. Varreduras intencionais ficam em
+`ALLOWED_SCANS` por local, rótulo da variante e tabela, com o motivo: uma
+varredura permitida na primeira página não esconde a mesma varredura nas
+variantes que deveriam usar índice.
+"""
+
+import argparse
+import ast
+import logging
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from application.src.database import migracoes
+from application.src.database.conexao import close_pools
+from application.src.database.feed_dao import FEED_SELECT
+from application.src.services.post_mirror import FEATURED_RULES, POST_COLUMNS, _casefold
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Pastas sem SQL da aplicação (ou com SQL próprio, como o benchmark)
+SKIP_DIRS = {"static", "templates", "__pycache__", "utils"}
+# Migrações rodam uma vez (backfills varrem a tabela de propósito)
+SKIP_FILES = {"migracoes.py"}
+
+SQL_STATEMENT = re.compile(
+    r"^\s*(SELECT\b.*\bFROM\b|UPDATE\s+\w+\s+SET\b|DELETE\s+FROM\b|INSERT\s+(OR\s+\w+\s+)?INTO\b|WITH\b)",
+    re.IGNORECASE | re.DOTALL,
+)
+SCAN_ROW = re.compile(r"^SCAN (?:TABLE )?(\w+)(.*)$")
+
+# Partes dinâmicas comuns a qualquer consulta
+COMMON_VARIANTS = {
+    "placeholders": ["?, ?, ?"],
+    "POST_COLUMNS": [POST_COLUMNS],
+}
+
+# Variantes por local ("arquivo:função") das f-strings com partes dinâmicas:
+# (rótulo, valores)
+DYNAMIC_VARIANTS = {
+    "post_mirror.py:_read": [
+        ("primeira_pagina", {"where": "", "order": "id DESC"}),
+        ("proxima_pagina", {"where": "WHERE id < ?", "order": "id DESC"}),
+        ("perfil", {"where": "WHERE user_id = ?", "order": "id DESC"}),
+        (
+            "busca",
+            {
+                "where": "WHERE instr(casefold(titulo), ?) > 0 OR instr(casefold(post), ?) > 0",
+                "order": "id DESC",
+            },
+        ),
+    ]
+    + [
+        (f"destaque:{rule}", {"where": f"WHERE {where}", "order": order})
+        for rule, (where, order) in FEATURED_RULES.items()
+    ],
+    "user_service.py:_load_user_info": [
+        ("id", {"column": "id"}),
+        ("name", {"column": "name"}),
+    ],
+    "configure_users.py:refresh_user_card": [
+        ("id", {"column": "id"}),
+        ("email", {"column": "email"}),
+    ],
+    "recommendations.py:recommendationsUser": [("amostra", {"limit": "4"})],
+    "feed_dao.py:_query": [
+        ("primeira_pagina", {"FEED_SELECT": FEED_SELECT, "where": ""}),
+        ("proxima_pagina", {"FEED_SELECT": FEED_SELECT, "where": "WHERE p.id < ?"}),
+        ("perfil", {"FEED_SELECT": FEED_SELECT, "where": "WHERE p.user_id = ?"}),
+    ],
+}
+
+# Varreduras completas aceitas: (local, rótulo da variante, tabela) -> motivo.
+# Consultas sem partes dinâmicas usam o rótulo None.
+ALLOWED_SCANS = {
+    (
+        "post_mirror.py:_sync",
+        None,
+        "post_espelho",
+    ): "a sincronização compara a versão de todos os posts",
+    (
+        "post_mirror.py:_read",
+        "primeira_pagina",
+        "post_espelho",
+    ): "ordem do rowid + LIMIT",
+    (
+        "post_mirror.py:_read",
+        "busca",
+        "post_espelho",
+    ): "busca por substring não usa índice",
+    ("post_mirror.py:_read", "destaque:first_liked", "post_espelho"): (
+        "ordem do rowid + LIMIT 1: para no primeiro post com likes suficientes "
+        "e o resultado fica em memória até a próxima sincronização"
+    ),
+    (
+        "recommendations.py:recommendationsUser",
+        "amostra",
+        "usuarios",
+    ): "amostra de poucos usuários (LIMIT)",
+    (
+        "feed_dao.py:<módulo>",
+        None,
+        "p",
+    ): "FEED_SELECT sem filtro; auditado com cada WHERE em feed_dao.py:_query",
+    ("feed_dao.py:_query", "primeira_pagina", "p"): "ordem do rowid + LIMIT",
+}
+
+
+class Statement:
+    def __init__(self, location: str, line: int, sql: str, variant: str = None):
+        self.location = location
+        self.line = line
+        self.sql = sql
+        self.variant = variant  # Rótulo em DYNAMIC_VARIANTS (None se o SQL é fixo)
+
+    def __repr__(self):
+        if self.variant is None:
+            return f"{self.location}:{self.line}"
+        return f"{self.location}:{self.line}[{self.variant}]"
+
+
+class SQLCollector(ast.NodeVisitor):
+    """Coleta as strings SQL de um arquivo, com a função em que aparecem."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.function = "<módulo>"
+        self.found = []  # (local, linha, partes) ; partes = str | ("dinâmico", expressão)
+
+    def visit_FunctionDef(self, node):
+        previous, self.function = self.function, node.name
+        self.generic_visit(node)
+        self.function = previous
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _location(self):
+        return f"{self.filename}:{self.function}"
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, str) and SQL_STATEMENT.match(node.value):
+            self.found.append((self._location(), node.lineno, [node.value]))
+
+    def visit_JoinedStr(self, node):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value)
+            else:
+                parts.append(("dinâmico", ast.unparse(value.value)))
+        # Partes com variante conhecida entram no teste (ex: o SELECT inteiro
+        # numa constante, como o FEED_SELECT do feed_dao)
+        known = DYNAMIC_VARIANTS.get(self._location(), [(None, {})])[0][1]
+        probe = "".join(
+            part if isinstance(part, str) else known.get(part[1], "x") for part in parts
+        )
+        if SQL_STATEMENT.match(probe):
+            self.found.append((self._location(), node.lineno, parts))
+        # Não desce nos filhos: as constantes da f-string já foram usadas
+
+
+def collect(src_dir: str = SRC_DIR):
+    """Retorna (consultas, não resolvidas) de todo o código em `src_dir`."""
+    statements, unresolved = [], []
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            if not name.endswith(".py") or name in SKIP_FILES:
+                continue
+            with open(os.path.join(root, name), encoding="utf-8") as file:
+                tree = ast.parse(file.read(), filename=name)
+            collector = SQLCollector(name)
+            collector.visit(tree)
+
+            for location, line, parts in collector.found:
+                names = sorted({part[1] for part in parts if not isinstance(part, str)})
+                if not names:
+                    statements.append(Statement(location, line, "".join(parts)))
+                    continue
+
+                variants = DYNAMIC_VARIANTS.get(location, [(None, {})])
+                expanded = 0
+                for label, variant in variants:
+                    values = {
+                        **{k: v[0] for k, v in COMMON_VARIANTS.items()},
+                        **variant,
+                    }
+                    if not all(name in values for name in names):
+                        continue
+                    sql = "".join(
+                        part if isinstance(part, str) else values[part[1]]
+                        for part in parts
+                    )
+                    statements.append(Statement(location, line, sql, label))
+                    expanded += 1
+                if not expanded:
+                    unresolved.append((f"{location}:{line}", names))
+    return statements, unresolved
+
+
+def seed(users_db: str, posts_db: str, users: int = 300, posts: int = 1000):
+    """Dados de exemplo: o planejador escolhe índices olhando as estatísticas."""
+    with sqlite3.connect(users_db) as banco:
+        banco.executemany(
+            "INSERT INTO usuarios (name, last_name, email, password) VALUES (?, ?, ?, ?)",
+            ((f"user{i}", "teste", f"user{i}@devorbit.dev", "x") for i in range(users)),
+        )
+        banco.executemany(
+            "INSERT INTO user_information (id, name, email, username, occupation) VALUES (?, ?, ?, ?, ?)",
+            (
+                (i + 1, f"user{i}", f"user{i}@devorbit.dev", f"@user{i}", "dev")
+                for i in range(users)
+            ),
+        )
+        banco.execute("ANALYZE")
+
+    with sqlite3.connect(posts_db) as banco:
+        banco.executemany(
+            f"INSERT INTO post_espelho ({POST_COLUMNS}, versao) VALUES (?, ?, ?, ?, ?, ?, NULL, datetime('now'), '')",
+            (
+                (i, i % users, f"user{i % users}", f"titulo {i}", "texto", i % 7)
+                for i in range(1, posts + 1)
+            ),
+        )
+        banco.executemany(
+            "INSERT INTO comentario_espelho (post_id, comment_id, user_id, comment) VALUES (?, ?, ?, ?)",
+            ((i % posts + 1, i, i % users, "comentário") for i in range(posts * 2)),
+        )
+        banco.executemany(
+            "INSERT INTO post_do_usuario (nome) VALUES (?)",
+            ((f"user{i % users}",) for i in range(posts)),
+        )
+        banco.execute("ANALYZE")
+
+
+def explain(banco, sql: str) -> list:
+    params = [None] * sql.count("?")
+    return [row[3] for row in banco.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def audit(statements: list, users_db: str, posts_db: str) -> list:
+    """
+    Roda o plano de cada consulta no banco em que as tabelas existem. O banco
+    de posts também fica anexado ao de usuários como `posts`, como no
+    `feed_db()`, para as consultas entre os dois.
+    """
+    connections = [sqlite3.connect(users_db), sqlite3.connect(posts_db)]
+    connections[0].execute("ATTACH DATABASE ? AS posts", (posts_db,))
+    for banco in connections:
+        banco.create_function("casefold", 1, _casefold, deterministic=True)
+    results = []
+    try:
+        for statement in statements:
+            plan, error = None, None
+            for banco in connections:
+                try:
+                    plan = explain(banco, statement.sql)
+                    break
+                except sqlite3.OperationalError as erro:
+                    error = str(erro)
+            scans = []
+            for detail in plan or []:
+                match = SCAN_ROW.match(detail)
+                if match and "INDEX" not in match.group(2):
+                    scans.append(match.group(1))
+            results.append(
+                {
+                    "statement": statement,
+                    "plan": plan,
+                    "error": None if plan is not None else error,
+                    "scans": scans,
+                }
+            )
+    finally:
+        for banco in connections:
+            banco.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--check", action="store_true", help="exit 1 se houver varredura não permitida"
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="mostra o plano de todas as consultas",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    statements, unresolved = collect()
+
+    with tempfile.TemporaryDirectory() as directory:
+        users_db = os.path.join(directory, "usuarios.db")
+        posts_db = os.path.join(directory, "banco_posts_comunidade.db")
+        migracoes.migrate(users_db, migracoes.USERS_MIGRATIONS)
+        migracoes.migrate(posts_db, migracoes.POSTS_MIGRATIONS)
+        close_pools()
+        seed(users_db, posts_db)
+        results = audit(statements, users_db, posts_db)
+
+    failures = 0
+    for result in results:
+        statement = result["statement"]
+        sql = " ".join(statement.sql.split())
+        if result["error"]:
+            failures += 1
+            logging.error(
+                f"{statement}: não foi possível planejar ({result['error']}): {sql[:120]}"
+            )
+            continue
+
+        bad = [
+            table
+            for table in result["scans"]
+            if (statement.location, statement.variant, table) not in ALLOWED_SCANS
+        ]
+        if bad:
+            failures += 1
+            logging.error(
+                f"{statement}: varredura completa em {', '.join(bad)}: {sql[:120]}"
+            )
+            for detail in result["plan"]:
+                logging.error(f"    {detail}")
+        elif args.verbose:
+            logging.info(f"{statement}: {' | '.join(result['plan'])}")
+
+    for location, names in unresolved:
+        failures += 1
+        logging.error(
+            f"{location}: SQL dinâmico sem variantes em DYNAMIC_VARIANTS ({', '.join(names)})"
+        )
+
+    logging.info(f"{len(results)} consultas auditadas, {failures} problema(s)")
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
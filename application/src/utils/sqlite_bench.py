@@ -0,0 +1,187 @@
+"""
+Compara os perfis de armazenamento do SQLite sob carga mista de leitura/escrita.
+
+Cria um banco temporário parecido com o de posts (espelho + posts do
+usuário), roda leitores (página do feed) e escritores (post novo + like)
+em threads ao mesmo tempo e mostra vazão, latência e erros por perfil:
+
+    python -m application.src.utils.sqlite_bench
+    python -m application.src.utils.sqlite_bench --readers 16 --writers 4 --seconds 10
+
+"legacy" é a configuração antiga (rollback journal, pragmas padrão) e
+"wal" é o perfil usado pela aplicação (database/conexao.py).
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from application.src.database.conexao import (
+    DB_MEMORY_PRAGMAS,
+    POSTS_DB,
+    STORAGE_PROFILES,
+    ConnectionPool,
+)
+
+SCHEMA = """
+CREATE TABLE post_espelho (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER,
+    nome TEXT,
+    titulo TEXT,
+    post TEXT,
+    likes INTEGER DEFAULT 0,
+    data TEXT
+);
+CREATE TABLE post_do_usuario (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    img_path TEXT NULL,
+    data TEXT DEFAULT (datetime('now', 'localtime'))
+);
+"""
+
+
+def seed(path: str, posts: int):
+    with sqlite3.connect(path) as banco:
+        banco.executescript(SCHEMA)
+        banco.executemany(
+            "INSERT INTO post_espelho (id, user_id, nome, titulo, post, likes, data) VALUES (?, ?, ?, ?, ?, ?, datetime('now'))",
+            (
+                (i, i % 50, f"user{i % 50}", f"titulo {i}", "conteúdo " * 40, 0)
+                for i in range(1, posts + 1)
+            ),
+        )
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run_profile(profile: str, directory: str, args) -> dict:
+    path = os.path.join(directory, f"bench_{profile}.db")
+    seed(path, args.posts)
+
+    readers = ConnectionPool(path, args.readers, readonly=True, profile=profile)
+    writers = ConnectionPool(path, args.writers, profile=profile)
+    if profile != "legacy":
+        for pool in (readers, writers):
+            pool.pragmas.update(DB_MEMORY_PRAGMAS[POSTS_DB])
+
+    latencies = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.seconds
+
+    def record(kind, start, failed=False):
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            if failed:
+                errors[kind] += 1
+            else:
+                latencies[kind].append(elapsed)
+
+    def reader():
+        while time.monotonic() < deadline:
+            cursor = random.randint(1, args.posts)
+            start = time.perf_counter()
+            try:
+                with readers.connection() as banco:
+                    banco.execute(
+                        "SELECT id, nome, titulo, post, likes FROM post_espelho WHERE id < ? ORDER BY id DESC LIMIT 21",
+                        (cursor,),
+                    ).fetchall()
+                record("read", start)
+            except sqlite3.OperationalError:  # database is locked
+                record("read", start, failed=True)
+
+    def writer():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                with writers.connection() as banco:
+                    banco.execute(
+                        "INSERT INTO post_do_usuario (nome) VALUES (?)", ("bench",)
+                    )
+                    banco.execute(
+                        "UPDATE post_espelho SET likes = likes + 1 WHERE id = ?",
+                        (random.randint(1, args.posts),),
+                    )
+                    banco.commit()
+                record("write", start)
+            except sqlite3.OperationalError:
+                record("write", start, failed=True)
+            time.sleep(args.write_pause)
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    readers.close_all()
+    writers.close_all()
+
+    result = {"profile": profile}
+    for kind in ("read", "write"):
+        values = latencies[kind]
+        result[kind] = {
+            "ops_per_s": round(len(values) / args.seconds, 1),
+            "p50_ms": round(statistics.median(values), 2) if values else 0.0,
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(max(values, default=0.0), 2),
+            "errors": errors[kind],
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["legacy", "wal"],
+        choices=sorted(STORAGE_PROFILES),
+    )
+    parser.add_argument("--readers", type=int, default=8, help="threads lendo o feed")
+    parser.add_argument(
+        "--writers", type=int, default=2, help="threads postando/curtindo"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=5, help="duração de cada perfil"
+    )
+    parser.add_argument(
+        "--posts", type=int, default=5000, help="posts no banco de teste"
+    )
+    parser.add_argument(
+        "--write-pause", type=float, default=0.005, help="pausa (s) entre escritas"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in args.profiles:
+            result = run_profile(profile, directory, args)
+            for kind in ("read", "write"):
+                stats = result[kind]
+                logging.info(
+                    f"{profile:>6} {kind:>5}: {stats['ops_per_s']:>8} ops/s  "
+                    f"p50 {stats['p50_ms']}ms  p95 {stats['p95_ms']}ms  "
+                    f"p99 {stats['p99_ms']}ms  max {stats['max_ms']}ms  erros {stats['errors']}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+# Os caminhos dos bancos são lidos no import de `conexao`: aponta para uma
+# pasta temporária antes de importar qualquer coisa da aplicação
+_DB_DIR = tempfile.mkdtemp(prefix="devorbit-tests-")
+os.environ["BANCO_DB"] = os.path.join(_DB_DIR, "usuarios.db")
+os.environ["BANCO_POST"] = os.path.join(_DB_DIR, "banco_posts_comunidade.db")
+
+import pytest
+
+from application.src.database import migracoes
+from application.src.database.conexao import POSTS_DB, USERS_DB, close_pools, users_db
+
+
+def _remove(path: str):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+@pytest.fixture
+def databases():
+    """Bancos novos, migrados, para cada teste."""
+    close_pools()
+    for path in (USERS_DB, POSTS_DB):
+        _remove(path)
+    migracoes.run_migrations()
+    yield
+    close_pools()
+
+
+@pytest.fixture
+def make_user(databases):
+    """Cria um usuário (com o card do feed) e retorna o id."""
+
+    def create(name: str) -> int:
+        with users_db() as banco:
+            user_id = banco.execute(
+                "INSERT INTO usuarios (name, last_name, email, password) VALUES (?, ?, ?, ?)",
+                (name, "teste", f"{name.lower()}@devorbit.dev", "x"),
+            ).lastrowid
+            banco.execute(
+                "INSERT INTO user_card (id, name) VALUES (?, ?)", (user_id, name)
+            )
+            banco.commit()
+        return user_id
+
+    return create
@@ -0,0 +1,115 @@
+from application.src.database.conexao import users_db
+from application.src.database.users.follow_graph import follow_graph
+from application.src.services.invalidation import PROFILE_UPDATED, bus
+
+
+def counters(user_id: int):
+    with users_db(readonly=True) as banco:
+        return banco.execute(
+            "SELECT followers, following FROM usuarios WHERE id = ?", (user_id,)
+        ).fetchone()
+
+
+def edges():
+    with users_db(readonly=True) as banco:
+        return banco.execute(
+            "SELECT follower_id, followed_id FROM seguidores"
+        ).fetchall()
+
+
+def profile_events() -> int:
+    return bus.metrics().get(PROFILE_UPDATED, 0)
+
+
+def test_follow_creates_edge_and_counters(make_user):
+    ana, bob = make_user("Ana"), make_user("Bob")
+    before = profile_events()
+
+    result = follow_graph.follow(ana, bob)
+
+    assert result == {
+        "followers": 1,
+        "following_count": 1,
+        "following": True,
+        "changed": True,
+    }
+    assert edges() == [(ana, bob)]
+    assert counters(ana) == (0, 1)
+    assert counters(bob) == (1, 0)
+    assert profile_events() - before == 2  # Os dois perfis
+
+
+def test_repeat_follow_is_idempotent(make_user):
+    ana, bob = make_user("Ana"), make_user("Bob")
+    follow_graph.follow(ana, bob)
+    before = profile_events()
+
+    result = follow_graph.follow(ana, bob)
+
+    assert result["changed"] is False
+    assert result["followers"] == 1 and result["following_count"] == 1
+    assert edges() == [(ana, bob)]
+    assert counters(bob) == (1, 0)
+    assert profile_events() == before  # Nada mudou, nada a invalidar
+
+
+def test_unfollow_removes_edge_and_is_idempotent(make_user):
+    ana, bob = make_user("Ana"), make_user("Bob")
+    follow_graph.follow(ana, bob)
+
+    first = follow_graph.unfollow(ana, bob)
+    second = follow_graph.unfollow(ana, bob)
+
+    assert first == {
+        "followers": 0,
+        "following_count": 0,
+        "following": False,
+        "changed": True,
+    }
+    assert second["changed"] is False
+    assert edges() == []
+    assert counters(ana) == (0, 0)
+    assert counters(bob) == (0, 0)
+
+
+def test_missing_target_returns_none(make_user):
+    ana = make_user("Ana")
+
+    assert follow_graph.follow(ana, 999) is None
+    assert follow_graph.unfollow(ana, 999) is None
+    assert edges() == []
+    assert counters(ana) == (0, 0)
+
+
+def test_counters_track_several_followers(make_user):
+    ana, bob, carla = make_user("Ana"), make_user("Bob"), make_user("Carla")
+    follow_graph.follow(ana, carla)
+    follow_graph.follow(bob, carla)
+    follow_graph.follow(ana, bob)
+    follow_graph.unfollow(bob, carla)
+
+    assert counters(carla) == (1, 0)
+    assert counters(ana) == (0, 2)
+    assert counters(bob) == (1, 0)
+
+    users, next_cursor = follow_graph.following(ana, limit=1)
+    assert [user["id"] for user in users] == [carla] and next_cursor == carla
+    users, next_cursor = follow_graph.following(ana, cursor=next_cursor, limit=1)
+    assert [user["id"] for user in users] == [bob] and next_cursor is None
+
+
+def test_follows_many(make_user):
+    ana, bob, carla, davi = (
+        make_user(name) for name in ("Ana", "Bob", "Carla", "Davi")
+    )
+    follow_graph.follow(ana, bob)
+    follow_graph.follow(ana, davi)
+    follow_graph.follow(carla, bob)
+
+    assert follow_graph.follows_many(ana, [bob, carla, davi, bob, "x"]) == {bob, davi}
+    assert follow_graph.follows_many(str(ana), [str(bob)]) == {
+        bob
+    }  # current_user.get_id()
+    assert follow_graph.follows_many(davi, [ana, bob]) == set()
+    assert follow_graph.follows_many(None, [bob]) == set()
+    assert follow_graph.follows_many(ana, []) == set()
@@ -0,0 +1,55 @@
+from application.src.services.perfil_cache import ProfileCache
+
+ANA = {"id": 1, "username": "Ana", "user_photo": None}
+
+
+def test_loaded_profile_is_cached():
+    cache = ProfileCache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return dict(ANA)
+
+    assert cache.get(("id", 1), loader) == ANA
+    assert cache.get(("id", 1), loader) == ANA
+    assert len(loads) == 1
+
+
+def test_invalidate_during_load_is_not_lost():
+    cache = ProfileCache()
+
+    def stale_loader():
+        # Leu o perfil antigo; a escrita faz commit e invalida antes do `get` guardar
+        cache.invalidate(user_id=1)
+        return dict(ANA)
+
+    assert cache.get(("id", 1), stale_loader) == ANA
+    assert cache.metrics()["entries"] == 0
+    assert cache.metrics()["discarded"] == 1
+
+    fresh = {**ANA, "user_photo": "fotos/nova.png"}
+    assert cache.get(("id", 1), lambda: dict(fresh)) == fresh
+    assert cache.get(("id", 1), lambda: dict(ANA)) == fresh  # Agora em cache
+
+
+def test_invalidate_by_id_covers_a_load_by_name():
+    cache = ProfileCache()
+
+    def stale_loader():
+        cache.invalidate(user_id=1)  # Só o id: a leitura é pelo nome
+        return dict(ANA)
+
+    cache.get(("name", "Ana"), stale_loader)
+    assert cache.metrics()["entries"] == 0
+
+
+def test_invalidating_another_user_does_not_discard():
+    cache = ProfileCache()
+
+    def loader():
+        cache.invalidate(user_id=2)
+        return dict(ANA)
+
+    cache.get(("id", 1), loader)
+    assert cache.metrics()["entries"] == 1
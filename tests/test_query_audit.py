@@ -0,0 +1,36 @@
+from application.src.database.conexao import POSTS_DB, USERS_DB
+from application.src.utils import query_audit
+
+
+def run_audit():
+    """Audita todas as consultas do código nos bancos migrados do `databases`."""
+    statements, unresolved = query_audit.collect()
+    query_audit.seed(USERS_DB, POSTS_DB)
+    return statements, unresolved, query_audit.audit(statements, USERS_DB, POSTS_DB)
+
+
+def scan_key(result, table):
+    statement = result["statement"]
+    return statement.location, statement.variant, table
+
+
+def test_no_full_scans_outside_the_allow_list(databases):
+    statements, unresolved, results = run_audit()
+
+    assert statements
+    assert unresolved == []  # Todo SQL dinâmico tem variantes em DYNAMIC_VARIANTS
+    assert [str(r["statement"]) for r in results if r["error"]] == []
+    bad = [
+        f"{result['statement']}: {table}"
+        for result in results
+        for table in result["scans"]
+        if scan_key(result, table) not in query_audit.ALLOWED_SCANS
+    ]
+    assert bad == []
+
+
+def test_allow_list_has_no_stale_entries(databases):
+    _, _, results = run_audit()
+
+    seen = {scan_key(result, table) for result in results for table in result["scans"]}
+    assert set(query_audit.ALLOWED_SCANS) - seen == set()
@@ -0,0 +1,68 @@
+import pytest
+
+from application.src.database.conexao import USERS_DB, get_pool, users_db
+from application.src.database.unit_of_work import users_unit
+from application.src.services.invalidation import PROFILE_UPDATED, bus
+
+
+def user_count() -> int:
+    with users_db(readonly=True) as banco:
+        return banco.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0]
+
+
+def profile_events() -> int:
+    return bus.metrics().get(PROFILE_UPDATED, 0)
+
+
+def insert_user(uow, name: str) -> int:
+    return uow.insert(
+        "INSERT INTO usuarios (name, last_name, email, password) VALUES (?, ?, ?, ?)",
+        (name, "teste", f"{name.lower()}@devorbit.dev", "x"),
+    )
+
+
+def test_commit_returns_ids_and_publishes_after_commit(databases):
+    before = profile_events()
+    seen = []
+
+    with users_unit() as uow:
+        user_id = insert_user(uow, "Ana")
+        uow.publish(PROFILE_UPDATED, user_id=user_id)
+        seen.append(profile_events())  # Ainda dentro da transação
+
+    assert user_id == 1
+    assert seen == [before]
+    assert profile_events() - before == 1
+    assert user_count() == 1
+
+
+def test_exception_rolls_back_and_publishes_nothing(databases):
+    before = profile_events()
+
+    with pytest.raises(RuntimeError), users_unit() as uow:
+        user_id = insert_user(uow, "Ana")
+        uow.execute("UPDATE usuarios SET followers = 10 WHERE id = ?", (user_id,))
+        uow.publish(PROFILE_UPDATED, user_id=user_id)
+        raise RuntimeError("falha no meio da unidade")
+
+    assert user_count() == 0
+    assert profile_events() == before
+
+    # A conexão volta limpa ao pool: a próxima unidade grava normalmente
+    with users_unit() as uow:
+        insert_user(uow, "Bob")
+    assert user_count() == 1
+
+
+def test_borrower_is_the_caller_not_the_wrapper(databases):
+    pool = get_pool(USERS_DB)
+
+    with users_unit():
+        callers = [caller for _, caller in pool._in_use.values()]
+    with users_db(readonly=True):
+        readers = [
+            caller for _, caller in get_pool(USERS_DB, readonly=True)._in_use.values()
+        ]
+
+    assert len(callers) == 1 and callers[0].startswith("test_unit_of_work.py:")
+    assert len(readers) == 1 and readers[0].startswith("test_unit_of_work.py:")